@@ -29,6 +29,7 @@ from app.models.execution import Execution
 from app.models.workflow import Workflow
 from app.schemas.preview import PreviewRequest, PreviewResponse
 from app.schemas.query import (
+    ExecutionCancelResponse,
     ExecutionHistoryItem,
     ExecutionListResponse,
     ExecutionRequest,
@@ -335,7 +336,11 @@ async def get_execution_status(
     )
 
 
-@router.post("/{execution_id}/cancel", status_code=status.HTTP_202_ACCEPTED)
+@router.post(
+    "/{execution_id}/cancel",
+    response_model=ExecutionCancelResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def cancel_execution(
     execution_id: UUID,
     tenant_id: UUID = Depends(get_current_tenant_id),
@@ -387,7 +392,7 @@ async def cancel_execution(
         node_id="__workflow__",
         status="cancelled",
     )
-    return {"id": str(execution_id), "status": "cancelled"}
+    return ExecutionCancelResponse(id=execution_id, status="cancelled")
 
 
 @router.get("/history/{workflow_id}", response_model=ExecutionListResponse)
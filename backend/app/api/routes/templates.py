@@ -3,6 +3,7 @@
 List, get, and instantiate pre-defined workflow templates.
 """
 
+from functools import cache
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -32,26 +33,41 @@ from app.services.template_registry import (
 router = APIRouter()
 
 
+@cache
+def _template_response(template_id: str) -> TemplateResponse:
+    """Build the response model for a known template, once per process.
+
+    Templates are code-defined and never change at runtime. Callers check the
+    ID first, so unknown path params never enter the cache.
+    """
+    template = get_template(template_id)
+    if template is None:
+        raise KeyError(template_id)
+    return TemplateResponse(
+        id=template.id,
+        name=template.name,
+        description=template.description,
+        category=template.category,
+        tags=template.tags,
+        graph_json=template.graph_json,
+        thumbnail=template.thumbnail,
+    )
+
+
+@cache
+def _template_list_response() -> TemplateListResponse:
+    """Build the list response once per process."""
+    return TemplateListResponse(
+        items=[_template_response(t.id) for t in get_all_templates()]
+    )
+
+
 @router.get("", response_model=TemplateListResponse)
 async def list_templates(
     tenant_id: UUID = Depends(get_current_tenant_id),
 ):
     """List all available workflow templates."""
-    templates = get_all_templates()
-    return TemplateListResponse(
-        items=[
-            TemplateResponse(
-                id=t.id,
-                name=t.name,
-                description=t.description,
-                category=t.category,
-                tags=t.tags,
-                graph_json=t.graph_json,
-                thumbnail=t.thumbnail,
-            )
-            for t in templates
-        ]
-    )
+    return _template_list_response()
 
 
 @router.get("/{template_id}", response_model=TemplateResponse)
@@ -60,20 +76,11 @@ async def get_template_detail(
     tenant_id: UUID = Depends(get_current_tenant_id),
 ):
     """Get a single template by ID."""
-    template = get_template(template_id)
-    if not template:
+    if get_template(template_id) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Template not found"
         )
-    return TemplateResponse(
-        id=template.id,
-        name=template.name,
-        description=template.description,
-        category=template.category,
-        tags=template.tags,
-        graph_json=template.graph_json,
-        thumbnail=template.thumbnail,
-    )
+    return _template_response(template_id)
 
 
 @router.post(
@@ -120,5 +127,4 @@ async def instantiate_template_route(
     )
 
     await db.commit()
-    await db.refresh(workflow)
     return WorkflowResponse.model_validate(workflow)
@@ -4,11 +4,12 @@ Thin controllers: validate -> call service -> return Pydantic response.
 All queries are scoped by tenant_id from the JWT.
 """
 
-import json as _json
+import json
 import uuid as _uuid
 from datetime import UTC, datetime
 from uuid import UUID
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -39,8 +40,18 @@ router = APIRouter()
 
 
 def _validate_graph_json_size(graph_json: dict) -> None:
-    """Raise 400 if the serialized graph_json exceeds the configured limit."""
-    size = len(_json.dumps(graph_json, separators=(",", ":")))
+    """Raise 400 if the serialized graph_json exceeds the configured limit.
+
+    Measured as compact UTF-8 JSON, i.e. roughly what Postgres stores.
+    orjson rejects integers outside the 64-bit range, so graphs containing
+    one are measured with the stdlib encoder instead.
+    """
+    try:
+        size = len(orjson.dumps(graph_json))
+    except TypeError:
+        size = len(
+            json.dumps(graph_json, separators=(",", ":"), ensure_ascii=False).encode()
+        )
     if size > settings.max_graph_json_bytes:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -132,7 +143,6 @@ async def create_workflow(
     )
 
     await db.commit()
-    await db.refresh(workflow)
     return WorkflowResponse.model_validate(workflow)
 
 
@@ -194,7 +204,6 @@ async def update_workflow(
     )
 
     await db.commit()
-    await db.refresh(workflow)
     return WorkflowResponse.model_validate(workflow)
 
 
@@ -292,27 +301,33 @@ async def import_workflow(
 ):
     _validate_graph_json_size(body.graph_json)
 
-    # Regenerate all node and edge IDs to prevent collisions
-    graph = body.graph_json.copy()
+    # Regenerate all node and edge IDs to prevent collisions: one pass over
+    # nodes gives every node its own ID (even if old IDs are missing or
+    # repeated), one pass over edges rewrites references
     id_mapping: dict[str, str] = {}
-
-    nodes = graph.get("nodes", [])
-    for node in nodes:
-        old_id = node.get("id", "")
-        new_id = str(_uuid.uuid4())
-        id_mapping[old_id] = new_id
-        node["id"] = new_id
-
-    edges = graph.get("edges", [])
-    for edge in edges:
-        edge["id"] = str(_uuid.uuid4())
-        old_source = edge.get("source", "")
-        old_target = edge.get("target", "")
-        edge["source"] = id_mapping.get(old_source, old_source)
-        edge["target"] = id_mapping.get(old_target, old_target)
-
-    graph["nodes"] = nodes
-    graph["edges"] = edges
+    nodes = []
+    for node in body.graph_json.get("nodes", []):
+        new_id = _uuid.uuid4().hex
+        id_mapping[node.get("id", "")] = new_id
+        nodes.append({**node, "id": new_id})
+    edges = body.graph_json.get("edges", [])
+
+    def remap(node_id: str) -> str:
+        return id_mapping.get(node_id, node_id)
+
+    graph = {
+        **body.graph_json,
+        "nodes": nodes,
+        "edges": [
+            {
+                **edge,
+                "id": _uuid.uuid4().hex,
+                "source": remap(edge.get("source", "")),
+                "target": remap(edge.get("target", "")),
+            }
+            for edge in edges
+        ],
+    }
 
     workflow = Workflow(
         name=body.name,
@@ -338,7 +353,6 @@ async def import_workflow(
     )
 
     await db.commit()
-    await db.refresh(workflow)
     return WorkflowResponse.model_validate(workflow)
 
 
@@ -483,5 +497,4 @@ async def rollback_workflow(
     workflow.graph_json = target_version.graph_json
 
     await db.commit()
-    await db.refresh(workflow)
     return WorkflowResponse.model_validate(workflow)
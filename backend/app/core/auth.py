@@ -94,6 +94,19 @@ async def _decode_token(token: str) -> dict:
             ) from e
 
 
+async def _decode_request_token(request: Request, token: str) -> dict:
+    """Decode a request's Bearer token once and cache the claims on request.state.
+
+    The tenant, user and claims dependencies all need the same payload, so
+    without this a single request would verify the JWT signature up to 3 times.
+    """
+    claims = getattr(request.state, "jwt_claims", None)
+    if claims is None:
+        claims = await _decode_token(token)
+        request.state.jwt_claims = claims
+    return claims
+
+
 async def get_current_user_id(request: Request) -> UUID:
     """Extract and validate the current user from a Keycloak Bearer token.
 
@@ -118,7 +131,7 @@ async def get_current_user_id(request: Request) -> UUID:
         )
 
     assert token is not None
-    payload = await _decode_token(token)
+    payload = await _decode_request_token(request, token)
 
     sub = payload.get("sub")
     if not sub:
@@ -158,7 +171,7 @@ async def get_current_tenant_id(request: Request) -> UUID:
         )
 
     assert token is not None
-    payload = await _decode_token(token)
+    payload = await _decode_request_token(request, token)
 
     tenant_id = payload.get("tenant_id")
     if not tenant_id:
@@ -190,7 +203,7 @@ async def get_current_user_claims(request: Request) -> dict:
         )
 
     token = auth_header.removeprefix("Bearer ")
-    return await _decode_token(token)
+    return await _decode_request_token(request, token)
 
 
 async def validate_api_key(
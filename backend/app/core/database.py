@@ -37,7 +37,13 @@ class Base(DeclarativeBase):
 
 
 class TimestampMixin:
-    """Mixin providing created_at / updated_at columns."""
+    """Mixin providing created_at / updated_at columns.
+
+    eager_defaults fetches the server-generated timestamps with RETURNING
+    during INSERT/UPDATE, so callers need no refresh() round-trip to read them.
+    """
+
+    __mapper_args__ = {"eager_defaults": True}
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -48,6 +48,11 @@ websocket_messages_sent_total = Counter(
     "Total WebSocket messages sent",
     ["message_type"],
 )
+websocket_publish_failures_total = Counter(
+    "flowforge_websocket_publish_failures_total",
+    "Total WebSocket messages whose Redis publish failed",
+    ["message_type"],
+)
 
 # --- Cache ---
 cache_operations_total = Counter(
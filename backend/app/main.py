@@ -61,11 +61,13 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    # Shutdown: stop live data service, cancel subscriber, close pool
-    live_data_service.stop()
+    # Shutdown: stop live data service, cancel subscriber, flush pending
+    # publishes, close pool
+    await live_data_service.stop()
     subscriber_task.cancel()
     with contextlib.suppress(asyncio.CancelledError):
         await subscriber_task
+    await ws_manager.aclose()
     await mz_client.close_pool()
 
 
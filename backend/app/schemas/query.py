@@ -20,6 +20,11 @@ class ExecutionStatusResponse(BaseModel):
     node_statuses: dict[str, "NodeStatusResponse"] = {}
 
 
+class ExecutionCancelResponse(BaseModel):
+    id: UUID
+    status: str
+
+
 class NodeStatusResponse(BaseModel):
     status: str  # pending | running | completed | failed | skipped | cancelled
     started_at: str | None = None
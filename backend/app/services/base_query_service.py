@@ -8,8 +8,10 @@ import hashlib
 import json
 import logging
 import time
+from operator import itemgetter
 from typing import Literal
 
+import orjson
 import sqlglot
 from redis.asyncio import Redis
 
@@ -19,6 +21,52 @@ from app.services.workflow_compiler import CompiledSegment
 logger = logging.getLogger(__name__)
 
 
+def _canonical_json(payload: object) -> bytes:
+    """Serialize *payload* with sorted keys, for hashing into a cache key.
+
+    orjson rejects integers outside the 64-bit range, which user-supplied
+    filters and node configs can contain; those fall back to the stdlib
+    encoder.
+    """
+    try:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        return json.dumps(payload, sort_keys=True).encode()
+
+
+def _pack_rows(value: dict) -> dict:
+    """Return *value* with its ``rows`` stored column-wise for the cache.
+
+    Column names are written once rather than once per row, which makes wide
+    results roughly 3x smaller in Redis. Rows whose keys differ from the
+    first row's (e.g. Redis hash lookups) are cached as-is.
+    """
+    rows = value.get("rows")
+    if not rows or not isinstance(rows[0], dict) or not rows[0]:
+        return value
+    keys = list(rows[0])
+    width = len(keys)
+    if any(len(row) != width for row in rows):
+        return value
+    get = itemgetter(*keys)
+    try:
+        data = [get(row) for row in rows]
+    except KeyError:
+        return value
+    if width == 1:
+        data = [(v,) for v in data]
+    return {**value, "rows": {"columns": keys, "data": data}}
+
+
+def _unpack_rows(value: dict) -> dict:
+    """Inverse of _pack_rows; entries cached row-wise pass through untouched."""
+    packed = value.get("rows")
+    if isinstance(packed, dict):
+        keys = packed["columns"]
+        value["rows"] = [dict(zip(keys, row, strict=False)) for row in packed["data"]]
+    return value
+
+
 class BaseQueryService:
     """Base class for services that execute constrained queries with caching."""
 
@@ -33,16 +81,20 @@ class BaseQueryService:
         self._cache_key_prefix = cache_key_prefix
 
     def _compute_cache_key_hash(self, payload: dict) -> str:
-        """Compute SHA256 hash of a payload for cache key.
+        """Compute a BLAKE2b digest of a payload for cache key.
+
+        Same scheme as PreviewService._graph_digest: canonical JSON bytes
+        (see _canonical_json) hashed with a 128-bit BLAKE2b. Cache keys only need
+        collision resistance, not a cryptographic hash.
 
         Args:
             payload: Dictionary to hash (must be JSON-serializable)
 
         Returns:
-            Cache key with prefix + first 16 chars of hash
+            Cache key with prefix + 32-char hex digest
         """
-        serialized = json.dumps(payload, sort_keys=True)
-        digest = hashlib.sha256(serialized.encode()).hexdigest()[:16]
+        serialized = _canonical_json(payload)
+        digest = hashlib.blake2b(serialized, digest_size=16).hexdigest()
         return f"{self._cache_key_prefix}{digest}"
 
     async def _cache_get(
@@ -70,7 +122,7 @@ class BaseQueryService:
                 cache_operations_total.labels(
                     cache_type=cache_type, operation="get", status="hit"
                 ).inc()
-                return json.loads(raw)
+                return _unpack_rows(orjson.loads(raw))
 
             cache_operations_total.labels(
                 cache_type=cache_type, operation="get", status="miss"
@@ -88,15 +140,22 @@ class BaseQueryService:
     ) -> None:
         """Write to Redis cache with TTL. Errors logged, not raised.
 
+        Serialized with orjson: datetimes and UUIDs are encoded natively, any
+        other non-JSON value (e.g. Decimal) falls back to str(). ``rows`` is
+        stored column-wise (see _pack_rows); _cache_get restores it.
+
         Args:
             key: Cache key to write
-            value: Dictionary to cache (must be JSON-serializable)
+            value: Dictionary to cache
             ttl: Time-to-live in seconds
             cache_type: Type of cache for metrics ("preview" or "widget")
         """
         try:
             start = time.monotonic()
-            await self._redis.set(key, json.dumps(value), ex=ttl)
+            payload = orjson.dumps(
+                _pack_rows(value), default=str, option=orjson.OPT_NON_STR_KEYS
+            )
+            await self._redis.set(key, payload, ex=ttl)
             elapsed = time.monotonic() - start
 
             cache_operation_duration_seconds.labels(
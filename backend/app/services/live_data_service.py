@@ -13,10 +13,12 @@ fall back to polling. A periodic health check switches modes dynamically.
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import hashlib
 import json
 import logging
-from typing import TYPE_CHECKING
+from collections.abc import Coroutine
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 from app.core.config import settings
@@ -98,30 +100,35 @@ class LiveDataService:
         self._running = False
         self._materialize_available = False
         self._health_check_task: asyncio.Task | None = None  # type: ignore[type-arg]
+        # Set to run the next health check now instead of at the interval
+        self._health_check_requested = asyncio.Event()
+        # Strong refs to every spawned task — the event loop only holds weak
+        # ones, and a cancelled task is dropped from sub.task before it exits
+        self._background_tasks: set[asyncio.Task] = set()  # type: ignore[type-arg]
 
     def start(self) -> None:
         """Mark the service as running and start health checks."""
         self._running = True
         mz_subscribe = settings.materialize.materialize_subscribe_enabled
         if self._materialize is not None and mz_subscribe:
-            self._health_check_task = asyncio.create_task(
-                self._materialize_health_loop()
-            )
+            self._health_check_task = self._spawn(self._materialize_health_loop())
         logger.info("LiveDataService started")
 
-    def stop(self) -> None:
-        """Stop all polling/subscribe tasks."""
+    async def stop(self) -> None:
+        """Stop all polling/subscribe tasks and wait for them to exit.
+
+        Every task is cancelled first and then awaited together, so shutdown
+        takes one pass of the event loop rather than one per task. Tasks come
+        from _background_tasks, which also holds loops dropped by a mode
+        switch that are still unwinding.
+        """
         self._running = False
-        if self._health_check_task and not self._health_check_task.done():
-            self._health_check_task.cancel()
-        for sub in self._subscriptions.values():
-            if sub.task and not sub.task.done():
-                sub.task.cancel()
-        for view_sub in self._view_subscriptions.values():
-            if view_sub.task and not view_sub.task.done():
-                view_sub.task.cancel()
+        tasks = list(self._background_tasks)
+        for task in tasks:
+            task.cancel()
         self._subscriptions.clear()
         self._view_subscriptions.clear()
+        await asyncio.gather(*tasks, return_exceptions=True)
         logger.info("LiveDataService stopped")
 
     def subscribe_widget(
@@ -167,7 +174,7 @@ class LiveDataService:
         """Start the poll loop for a widget."""
         sub.mode = "poll"
         live_data_mode.labels(widget_id=str(sub.widget_id)).set(1)
-        sub.task = asyncio.create_task(self._poll_loop(sub))
+        sub.task = self._spawn(self._poll_loop(sub))
 
     def _start_subscribe_mode(self, sub: _WidgetSubscription) -> None:
         """Start or join a shared SUBSCRIBE for the widget's view."""
@@ -181,14 +188,19 @@ class LiveDataService:
         if view_name not in self._view_subscriptions:
             view_sub = _ViewSubscription(view_name)
             self._view_subscriptions[view_name] = view_sub
-            view_sub.task = asyncio.create_task(
-                self._subscribe_loop(view_name, sub.tenant_id)
-            )
+            view_sub.task = self._spawn(self._subscribe_loop(view_name, sub.tenant_id))
 
         view_sub = self._view_subscriptions[view_name]
         view_sub.widget_ids.add(sub.widget_id)
         view_sub.ref_count += 1
 
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> asyncio.Task:  # type: ignore[type-arg]
+        """Create a task and keep it referenced until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
     def _release_view_subscription(self, view_name: str, widget_id: UUID) -> None:
         """Decrement ref count on a shared view subscription."""
         view_sub = self._view_subscriptions.get(view_name)
@@ -289,11 +301,17 @@ class LiveDataService:
                     backoff,
                 )
                 backoff = min(backoff * 2, MAX_BACKOFF)
+                # Materialize may be down — probe now rather than at the interval
+                self._health_check_requested.set()
 
             await asyncio.sleep(backoff)
 
     async def _materialize_health_loop(self) -> None:
-        """Periodically check Materialize availability and switch modes."""
+        """Check Materialize availability and switch modes.
+
+        Runs every HEALTH_CHECK_INTERVAL, or as soon as a failing SUBSCRIBE
+        sets _health_check_requested.
+        """
         while self._running:
             try:
                 was_available = self._materialize_available
@@ -321,7 +339,11 @@ class LiveDataService:
             except Exception:
                 logger.exception("Materialize health check failed")
 
-            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._health_check_requested.wait(), HEALTH_CHECK_INTERVAL
+                )
+            self._health_check_requested.clear()
 
     def _upgrade_to_subscribe(self) -> None:
         """Switch eligible poll-mode widgets to subscribe mode."""
@@ -4,16 +4,20 @@ Layer 2: Content-addressed Redis cache (keyed on node config, not position).
 Layer 3: Query constraints (LIMIT, max_execution_time, max_memory_usage).
 """
 
+import hashlib
 import logging
 import time
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
 from uuid import UUID
 
 from redis.asyncio import Redis
 
 from app.core.graph import find_ancestors
-from app.services.base_query_service import BaseQueryService
+from app.services.base_query_service import BaseQueryService, _canonical_json
 from app.services.query_router import QueryRouter
-from app.services.workflow_compiler import WorkflowCompiler
+from app.services.workflow_compiler import CompiledSegment, WorkflowCompiler
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,26 @@ PREVIEW_MAX_ROWS_TO_READ = 10_000_000
 
 CACHE_KEY_PREFIX = "flowforge:preview:"
 
+# Compiled segments keyed on PreviewService._graph_digest. Paging through a
+# preview only changes offset/limit: the Redis cache misses, but the subgraph
+# compiles to the same SQL. Process-wide because a PreviewService is built
+# per request.
+SEGMENT_CACHE_SIZE = 256
+_segment_cache: OrderedDict[str, list[CompiledSegment]] = OrderedDict()
+
+
+@lru_cache(maxsize=128)
+def _subgraph_node_ids(
+    target_node_id: str, edge_pairs: tuple[tuple[str, str], ...]
+) -> frozenset[str]:
+    """Return target_node_id plus its ancestors, cached on the edge set.
+
+    Editing a node's config leaves the edges alone, so repeated previews of
+    the same graph skip the ancestor walk.
+    """
+    edges = [{"source": source, "target": target} for source, target in edge_pairs]
+    return frozenset(find_ancestors(target_node_id, edges) | {target_node_id})
+
 
 class PreviewService(BaseQueryService):
     """Executes preview queries with caching and resource constraints."""
@@ -61,8 +85,9 @@ class PreviewService(BaseQueryService):
         """
         limit = min(limit, PREVIEW_HARD_CAP)
 
+        digest = self._graph_digest(target_node_id, nodes, edges)
         cache_key = self._compute_cache_key(
-            tenant_id, target_node_id, nodes, edges, offset, limit
+            tenant_id, target_node_id, nodes, edges, offset, limit, digest=digest
         )
 
         # Layer 2: Cache check
@@ -73,7 +98,7 @@ class PreviewService(BaseQueryService):
 
         # Compile the subgraph leading to the target node
         start = time.monotonic()
-        segments = self._compiler.compile_subgraph(nodes, edges, target_node_id)
+        segments = self._compile_subgraph(digest, nodes, edges, target_node_id)
 
         if not segments:
             return {
@@ -131,41 +156,65 @@ class PreviewService(BaseQueryService):
         edges: list[dict],
         offset: int = 0,
         limit: int = PREVIEW_LIMIT,
+        *,
+        digest: str | None = None,
     ) -> str:
         """Compute a content-addressed cache key.
 
-        Strips UI-only fields (position, selected, dragging) to avoid
-        cache busts on node drag or selection changes.
         Includes tenant_id, offset, and limit so different tenants/pages
-        are cached separately.
+        are cached separately; the graph itself is folded into one digest.
+        Pass *digest* when the caller already has it from _graph_digest.
+        """
+        if digest is None:
+            digest = self._graph_digest(target_node_id, nodes, edges)
+        return (
+            f"{self._cache_key_prefix}{tenant_id}:{target_node_id}:"
+            f"{offset}:{limit}:{digest}"
+        )
+
+    def _compile_subgraph(
+        self,
+        digest: str,
+        nodes: list[dict],
+        edges: list[dict],
+        target_node_id: str,
+    ) -> list[CompiledSegment]:
+        """Compile the target's subgraph, reusing segments cached for *digest*."""
+        segments = _segment_cache.get(digest)
+        if segments is not None:
+            _segment_cache.move_to_end(digest)
+            return segments
+
+        segments = self._compiler.compile_subgraph(nodes, edges, target_node_id)
+        _segment_cache[digest] = segments
+        if len(_segment_cache) > SEGMENT_CACHE_SIZE:
+            _segment_cache.popitem(last=False)
+        return segments
+
+    @staticmethod
+    def _graph_digest(target_node_id: str, nodes: list[dict], edges: list[dict]) -> str:
+        """Digest the subgraph that feeds target_node_id.
+
+        Only ancestor nodes and the edges between them are serialized, and
+        UI-only fields (position, selected, dragging) are stripped so node
+        drags or selection changes don't bust the cache.
         """
-        ancestors = find_ancestors(target_node_id, edges)
-        ancestors.add(target_node_id)
+        edge_pairs = tuple((e["source"], e["target"]) for e in edges)
+        ancestors = _subgraph_node_ids(target_node_id, edge_pairs)
 
-        # Extract only config-relevant fields from ancestor nodes
         stable_nodes = sorted(
-            [
+            (
                 {"id": n["id"], "type": n.get("type"), "data": n.get("data")}
                 for n in nodes
                 if n["id"] in ancestors
-            ],
-            key=lambda n: n["id"],
+            ),
+            key=itemgetter("id"),
         )
         stable_edges = sorted(
-            [
-                {"source": e["source"], "target": e["target"]}
-                for e in edges
-                if e["source"] in ancestors and e["target"] in ancestors
-            ],
-            key=lambda e: (e["source"], e["target"]),
+            pair for pair in edge_pairs if pair[0] in ancestors and pair[1] in ancestors
         )
 
-        payload = {
-            "tenant_id": str(tenant_id),
-            "target": target_node_id,
-            "nodes": stable_nodes,
-            "edges": stable_edges,
-            "offset": offset,
-            "limit": limit,
-        }
-        return self._compute_cache_key_hash(payload)
+        canonical = _canonical_json(
+            {"target": target_node_id, "nodes": stable_nodes, "edges": stable_edges}
+        )
+        return hashlib.blake2b(canonical, digest_size=16).hexdigest()
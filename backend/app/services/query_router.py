@@ -42,9 +42,12 @@ def parse_redis_key(key: str) -> dict[str, str]:
     return {}
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryResult:
-    """Result from executing a compiled query segment."""
+    """Result from executing a compiled query segment.
+
+    Slotted: one is built per executed segment, and nothing adds attributes.
+    """
 
     columns: list[str]
     rows: list[dict]
@@ -12,8 +12,11 @@ import contextlib
 import json
 import logging
 import time
+from collections import Counter
+from functools import lru_cache
 from uuid import UUID
 
+import orjson
 from fastapi import WebSocket
 from redis.asyncio import Redis
 from redis.asyncio.client import PubSub
@@ -22,12 +25,43 @@ from app.core.metrics import (
     websocket_connections_active,
     websocket_message_delivery_seconds,
     websocket_messages_sent_total,
+    websocket_publish_failures_total,
 )
 
 logger = logging.getLogger(__name__)
 
 CHANNEL_PREFIX = "flowforge"
 HEARTBEAT_INTERVAL_SECONDS = 30
+# Outbound publishes are coalesced into one Redis pipeline per flush window.
+MAX_PUBLISH_BATCH = 256
+PUBLISH_FLUSH_INTERVAL_SECONDS = 0.002
+
+# (channel, serialized message, message_type) waiting for the next flush
+_QueuedPublish = tuple[str, bytes, str]
+
+
+@lru_cache(maxsize=4096)
+def _execution_channel_prefix(tenant_id: UUID) -> str:
+    """Return the execution channel prefix for a tenant, cached per tenant."""
+    return f"{CHANNEL_PREFIX}:{tenant_id}:execution:"
+
+
+@lru_cache(maxsize=4096)
+def _widget_channel_prefix(tenant_id: UUID) -> str:
+    """Return the widget channel prefix for a tenant, cached per tenant."""
+    return f"{CHANNEL_PREFIX}:{tenant_id}:widget:"
+
+
+def _dumps_message(message: dict) -> bytes:
+    """Serialize a pub/sub message; UUIDs and other non-JSON values become str.
+
+    orjson rejects integers outside the 64-bit range without consulting
+    ``default``, so those messages fall back to the stdlib encoder.
+    """
+    try:
+        return orjson.dumps(message, default=str)
+    except TypeError:
+        return json.dumps(message, default=str).encode()
 
 
 class WebSocketManager:
@@ -40,6 +74,8 @@ class WebSocketManager:
         self._heartbeat_task: asyncio.Task | None = None
         self._tenant_connections: dict[str, int] = {}
         self._pubsub: PubSub | None = None
+        self._publish_queue: asyncio.Queue[_QueuedPublish] = asyncio.Queue()
+        self._flush_task: asyncio.Task | None = None
 
     @staticmethod
     def _extract_tenant_id(channel: str) -> str | None:
@@ -92,6 +128,14 @@ class WebSocketManager:
 
         logger.info("WebSocket connected to channel: %s", channel)
 
+    def _remove_from_channel(self, websocket: WebSocket, channel: str) -> None:
+        """Drop a WebSocket from a channel's set, deleting the set once empty."""
+        connections = self._connections.get(channel)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
+                del self._connections[channel]
+
     async def subscribe_to_channel(self, websocket: WebSocket, channel: str) -> None:
         """Subscribe an already-connected WebSocket to an additional channel."""
         if channel not in self._connections:
@@ -106,10 +150,7 @@ class WebSocketManager:
         self, websocket: WebSocket, channel: str
     ) -> None:
         """Unsubscribe a WebSocket from a specific channel."""
-        if channel in self._connections:
-            self._connections[channel].discard(websocket)
-            if not self._connections[channel]:
-                del self._connections[channel]
+        self._remove_from_channel(websocket, channel)
         if websocket in self._ws_channels:
             self._ws_channels[websocket].discard(channel)
         logger.info("WebSocket unsubscribed from channel: %s", channel)
@@ -120,10 +161,7 @@ class WebSocketManager:
         H7 fix: Only decrement gauge if this is the last channel for this WebSocket.
         H8 fix: Clean up _ws_channels when all channels are removed.
         """
-        if channel in self._connections:
-            self._connections[channel].discard(websocket)
-            if not self._connections[channel]:
-                del self._connections[channel]
+        self._remove_from_channel(websocket, channel)
 
         # H2: Unsubscribe tenant when last connection for that tenant disconnects
         tenant_id = self._extract_tenant_id(channel)
@@ -148,10 +186,7 @@ class WebSocketManager:
         """
         channels = self._ws_channels.pop(websocket, set())
         for channel in channels:
-            if channel in self._connections:
-                self._connections[channel].discard(websocket)
-                if not self._connections[channel]:
-                    del self._connections[channel]
+            self._remove_from_channel(websocket, channel)
 
             # H2: Unsubscribe tenant when last connection disconnects
             tenant_id = self._extract_tenant_id(channel)
@@ -175,14 +210,13 @@ class WebSocketManager:
         """Publish an execution status update via Redis pub/sub."""
         message = {
             "type": "execution_status",
-            "execution_id": str(execution_id),
+            "execution_id": execution_id,
             "node_id": node_id,
             "status": status,
             "data": data or {},
         }
-        channel = f"{CHANNEL_PREFIX}:{tenant_id}:execution:{execution_id}"
-        await self._redis.publish(channel, json.dumps(message))
-        websocket_messages_sent_total.labels(message_type="execution_status").inc()
+        channel = _execution_channel_prefix(tenant_id) + str(execution_id)
+        await self._publish(channel, message, "execution_status")
 
     async def publish_live_data(
         self,
@@ -193,54 +227,138 @@ class WebSocketManager:
         """Publish live data update for a widget."""
         message = {
             "type": "live_data",
-            "widget_id": str(widget_id),
+            "widget_id": widget_id,
             "data": data,
         }
-        channel = f"{CHANNEL_PREFIX}:{tenant_id}:widget:{widget_id}"
-        await self._redis.publish(channel, json.dumps(message))
-        websocket_messages_sent_total.labels(message_type="live_data").inc()
+        channel = _widget_channel_prefix(tenant_id) + str(widget_id)
+        await self._publish(channel, message, "live_data")
+
+    async def _publish(self, channel: str, message: dict, message_type: str) -> None:
+        """Serialize a message and queue it for the next pipelined flush.
+
+        Starts the flush task on first use. ``message_type`` labels the
+        sent/failed metrics once the flush completes.
+        """
+        self._publish_queue.put_nowait((channel, _dumps_message(message), message_type))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def _drain_queue(self, limit: int) -> list[_QueuedPublish]:
+        """Pop up to ``limit`` queued messages without waiting."""
+        batch: list[_QueuedPublish] = []
+        while len(batch) < limit and not self._publish_queue.empty():
+            batch.append(self._publish_queue.get_nowait())
+        return batch
+
+    async def _publish_batch(self, batch: list[_QueuedPublish]) -> None:
+        """Send a batch of messages to Redis in a single pipeline round-trip.
+
+        Each message is counted as sent, or as failed if the pipeline raises;
+        the error still propagates to the caller.
+        """
+        counter = websocket_publish_failures_total
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for channel, payload, _ in batch:
+                    pipe.publish(channel, payload)
+                await pipe.execute()
+            counter = websocket_messages_sent_total
+        finally:
+            counts = Counter(message_type for _, _, message_type in batch)
+            for message_type, n in counts.items():
+                counter.labels(message_type=message_type).inc(n)
+
+    async def _flush_loop(
+        self, interval: float = PUBLISH_FLUSH_INTERVAL_SECONDS
+    ) -> None:
+        """Flush queued publishes in batches of up to MAX_PUBLISH_BATCH.
+
+        Waits for the first message, then gives concurrent publishers one
+        flush interval to add theirs before sending the batch. Messages taken
+        off the queue but not yet handed to Redis are still sent if the loop
+        is cancelled; a batch already in flight is not sent twice. Failed
+        batches are logged and counted in websocket_publish_failures_total.
+        """
+        batch: list[_QueuedPublish] = []
+        while True:
+            try:
+                batch.append(await self._publish_queue.get())
+                await asyncio.sleep(interval)
+                batch.extend(self._drain_queue(MAX_PUBLISH_BATCH - len(batch)))
+                in_flight, batch = batch, []
+                await self._publish_batch(in_flight)
+            except asyncio.CancelledError:
+                if batch:
+                    await self._publish_batch(batch)
+                break
+            except Exception as e:
+                logger.error("Error flushing WebSocket publishes to Redis: %s", e)
+
+    async def flush_now(self) -> None:
+        """Publish everything currently queued without waiting for the flusher."""
+        while batch := self._drain_queue(MAX_PUBLISH_BATCH):
+            await self._publish_batch(batch)
+
+    async def aclose(self) -> None:
+        """Stop the flush task and publish any messages still queued.
+
+        Call this on application shutdown.
+        """
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+        await self.flush_now()
+
+    @staticmethod
+    async def _send_timed(ws: WebSocket, message: str, channel_type: str) -> None:
+        """Send a message to one WebSocket and record its delivery latency."""
+        start = time.monotonic()
+        await ws.send_text(message)
+        websocket_message_delivery_seconds.labels(
+            channel_type=channel_type,
+        ).observe(time.monotonic() - start)
+
+    async def _send_to_many(
+        self, websockets: list[WebSocket], message: str, channel_type: str
+    ) -> list[WebSocket]:
+        """Send a message to all given WebSockets concurrently.
+
+        Returns the WebSockets whose send failed.
+        """
+        results = await asyncio.gather(
+            *(self._send_timed(ws, message, channel_type) for ws in websockets),
+            return_exceptions=True,
+        )
+        return [
+            ws
+            for ws, result in zip(websockets, results, strict=True)
+            if isinstance(result, Exception)
+        ]
 
     async def _broadcast_to_channel(self, channel: str, message: str) -> None:
         """Send a message to all local WebSocket connections on a channel.
 
         H8 fix: Clean up dead WebSockets from both _connections AND _ws_channels.
         """
-        connections = self._connections.get(channel, set())
-        dead: set[WebSocket] = set()
-
-        channel_type = self._extract_channel_type(channel)
-        for ws in connections:
-            try:
-                start = time.monotonic()
-                await ws.send_text(message)
-                elapsed = time.monotonic() - start
-                websocket_message_delivery_seconds.labels(
-                    channel_type=channel_type,
-                ).observe(elapsed)
-            except Exception:
-                dead.add(ws)
+        # Snapshot: connections may change while the sends are in flight
+        connections = list(self._connections.get(channel, ()))
+        dead = await self._send_to_many(
+            connections, message, self._extract_channel_type(channel)
+        )
 
         # H8: Clean up dead WebSockets from both sides
-        for ws in dead:
-            connections.discard(ws)
-            # Also remove from _ws_channels to prevent memory leak
-            await self.disconnect_all(ws)
+        if dead:
+            live = self._connections.get(channel)
+            if live is not None:
+                live.difference_update(dead)
+            for ws in dead:
+                # Also remove from _ws_channels to prevent memory leak
+                await self.disconnect_all(ws)
 
     async def _broadcast_to_all(self, message: str) -> None:
         """Send a message to every connected WebSocket client."""
-        dead: set[WebSocket] = set()
-
-        for ws in self._ws_channels:
-            try:
-                start = time.monotonic()
-                await ws.send_text(message)
-                elapsed = time.monotonic() - start
-                websocket_message_delivery_seconds.labels(
-                    channel_type="broadcast",
-                ).observe(elapsed)
-            except Exception:
-                dead.add(ws)
-
+        dead = await self._send_to_many(list(self._ws_channels), message, "broadcast")
         for ws in dead:
             await self.disconnect_all(ws)
 
@@ -4,10 +4,10 @@ import json
 from unittest.mock import AsyncMock, patch
 from uuid import UUID
 
-import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.routes.widgets import get_widget_data
 from app.models.dashboard import Dashboard, Widget
 from app.models.workflow import Workflow
 
@@ -19,8 +19,7 @@ async def _create_dashboard(
 ) -> Dashboard:
     dashboard = Dashboard(name=name, tenant_id=tenant_id, created_by=user_id)
     db.add(dashboard)
-    await db.commit()
-    await db.refresh(dashboard)
+    await db.flush()
     return dashboard
 
 
@@ -49,8 +48,7 @@ async def _create_workflow(
         },
     )
     db.add(workflow)
-    await db.commit()
-    await db.refresh(workflow)
+    await db.flush()
     return workflow
 
 
@@ -70,15 +68,13 @@ async def _create_widget(
         config_overrides={},
     )
     db.add(widget)
-    await db.commit()
-    await db.refresh(widget)
+    await db.flush()
     return widget
 
 
 # ── GET /dashboards/{id}/widgets ──────────────────────────────────────
 
 
-@pytest.mark.asyncio
 async def test_list_dashboard_widgets_returns_widgets(
     client: AsyncClient,
     db_session: AsyncSession,
@@ -103,7 +99,6 @@ async def test_list_dashboard_widgets_returns_widgets(
     assert str(w2.id) in widget_ids
 
 
-@pytest.mark.asyncio
 async def test_list_dashboard_widgets_empty(
     client: AsyncClient,
     db_session: AsyncSession,
@@ -120,7 +115,6 @@ async def test_list_dashboard_widgets_empty(
     assert response.json() == []
 
 
-@pytest.mark.asyncio
 async def test_list_dashboard_widgets_different_tenant_404(
     client: AsyncClient,
     db_session: AsyncSession,
@@ -144,7 +138,6 @@ async def test_list_dashboard_widgets_different_tenant_404(
 # ── Widget data includes chart_config ─────────────────────────────────
 
 
-@pytest.mark.asyncio
 async def test_widget_data_includes_chart_config(
     client: AsyncClient,
     db_session: AsyncSession,
@@ -196,16 +189,17 @@ async def test_widget_data_includes_chart_config(
 # ── Widget data accepts filters param ──────────────────────────────────
 
 
-@pytest.mark.asyncio
 async def test_widget_data_accepts_filters_param(
-    client: AsyncClient,
     db_session: AsyncSession,
-    mock_auth,
     seed_user_a,
     tenant_id: UUID,
     user_id: UUID,
 ):
-    """GET /widgets/{id}/data accepts a filters query parameter."""
+    """get_widget_data passes decoded filters through to the data service.
+
+    Calls the route handler directly — JSON decoding over HTTP is covered by
+    test_widget_data_invalid_filters_returns_400.
+    """
     dashboard = await _create_dashboard(db_session, tenant_id, user_id)
     workflow = await _create_workflow(db_session, tenant_id, user_id)
     widget = await _create_widget(db_session, dashboard.id, workflow.id)
@@ -220,38 +214,30 @@ async def test_widget_data_accepts_filters_param(
         "limit": 10000,
         "chart_config": None,
     }
-
-    from app.api.deps import get_widget_data_service
-    from app.main import app as test_app
-
     mock_service = AsyncMock()
     mock_service.fetch_widget_data = AsyncMock(return_value=mock_result)
-    test_app.dependency_overrides[get_widget_data_service] = lambda: mock_service
 
-    try:
-        filters = json.dumps(
-            [
-                {
-                    "column": "date",
-                    "type": "date_range",
-                    "value": {"from": "2024-01-01", "to": "2024-12-31"},
-                }
-            ]
-        )
-        response = await client.get(
-            f"/api/v1/widgets/{widget.id}/data",
-            params={"filters": filters},
-        )
-        assert response.status_code == 200
-
-        # Verify service was called with filter_params
-        call_kwargs = mock_service.fetch_widget_data.call_args[1]
-        assert call_kwargs["filter_params"] is not None
-    finally:
-        test_app.dependency_overrides.pop(get_widget_data_service, None)
-
-
-@pytest.mark.asyncio
+    filters = [
+        {
+            "column": "date",
+            "type": "date_range",
+            "value": {"from": "2024-01-01", "to": "2024-12-31"},
+        }
+    ]
+    await get_widget_data(
+        widget_id=widget.id,
+        offset=0,
+        limit=1_000,
+        filters=json.dumps(filters),
+        tenant_id=tenant_id,
+        db=db_session,
+        widget_data_service=mock_service,
+    )
+
+    call_kwargs = mock_service.fetch_widget_data.call_args[1]
+    assert call_kwargs["filter_params"] == filters
+
+
 async def test_widget_data_invalid_filters_returns_400(
     client: AsyncClient,
     db_session: AsyncSession,
@@ -276,7 +262,6 @@ async def test_widget_data_invalid_filters_returns_400(
 # ── Dashboard CRUD ────────────────────────────────────────────────────
 
 
-@pytest.mark.asyncio
 async def test_create_dashboard_returns_201(
     client: AsyncClient,
     db_session: AsyncSession,
@@ -296,7 +281,6 @@ async def test_create_dashboard_returns_201(
     assert "id" in data
 
 
-@pytest.mark.asyncio
 async def test_list_dashboards_filters_by_tenant(
     client: AsyncClient,
     db_session: AsyncSession,
@@ -326,7 +310,6 @@ async def test_list_dashboards_filters_by_tenant(
     assert "Tenant B Dash" not in names
 
 
-@pytest.mark.asyncio
 async def test_get_dashboard_other_tenant_returns_404(
     client: AsyncClient,
     db_session: AsyncSession,
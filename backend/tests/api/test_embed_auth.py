@@ -5,9 +5,10 @@ Run: pytest backend/tests/api/test_embed_auth.py -v --noconftest
 
 import hashlib
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
-from uuid import uuid4
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
 
 import pytest
 
@@ -20,22 +21,36 @@ from app.core.auth import validate_api_key
 # ── Helpers ───────────────────────────────────────────────────────────────
 
 
-def _make_api_key_record(
-    tenant_id=None, user_id=None, scoped_widget_ids=None, rate_limit=None
-):
-    """Create a mock APIKey model instance."""
-    record = MagicMock()
-    record.tenant_id = tenant_id or uuid4()
-    record.user_id = user_id or uuid4()
-    record.scoped_widget_ids = scoped_widget_ids
-    record.rate_limit = rate_limit
-    return record
+@dataclass(slots=True)
+class _APIKeyRecord:
+    """Stand-in for the APIKey columns read by validate_api_key."""
+
+    tenant_id: UUID = field(default_factory=uuid4)
+    user_id: UUID = field(default_factory=uuid4)
+    scoped_widget_ids: list[UUID] | None = None
+    rate_limit: int | None = None
+
+
+class _Result:
+    """Stand-in for a SQLAlchemy Result holding at most one row."""
+
+    def __init__(self, record: _APIKeyRecord | None):
+        self._record = record
+
+    def scalar_one_or_none(self) -> _APIKeyRecord | None:
+        return self._record
+
+
+def _mock_db(record: _APIKeyRecord | None) -> AsyncMock:
+    """Create a mock session whose execute() yields the given record."""
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=_Result(record))
+    return db
 
 
 # ── Tests ─────────────────────────────────────────────────────────────────
 
 
-@pytest.mark.asyncio
 async def test_invalid_api_key_format_raises_401():
     """API key not starting with 'sk_live_' should raise 401."""
     db = AsyncMock()
@@ -45,24 +60,19 @@ async def test_invalid_api_key_format_raises_401():
     assert "Invalid API key format" in exc_info.value.detail
 
 
-@pytest.mark.asyncio
 async def test_valid_api_key_returns_scope_dict():
     """A valid, non-revoked API key should return the correct scope dict."""
     tenant_id = uuid4()
     user_id = uuid4()
     widget_ids = [uuid4(), uuid4()]
 
-    record = _make_api_key_record(
+    record = _APIKeyRecord(
         tenant_id=tenant_id,
         user_id=user_id,
         scoped_widget_ids=widget_ids,
         rate_limit=50,
     )
-
-    db = AsyncMock()
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = record
-    db.execute = AsyncMock(return_value=mock_result)
+    db = _mock_db(record)
 
     scope = await validate_api_key("sk_live_test123", db)
 
@@ -73,13 +83,9 @@ async def test_valid_api_key_returns_scope_dict():
     assert scope["key_hash"] == hashlib.sha256(b"sk_live_test123").hexdigest()
 
 
-@pytest.mark.asyncio
 async def test_revoked_key_raises_401():
     """A revoked or nonexistent API key should raise 401."""
-    db = AsyncMock()
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    db.execute = AsyncMock(return_value=mock_result)
+    db = _mock_db(None)
 
     with pytest.raises(HTTPException) as exc_info:
         await validate_api_key("sk_live_revoked_key", db)
@@ -87,25 +93,17 @@ async def test_revoked_key_raises_401():
     assert "Invalid or revoked" in exc_info.value.detail
 
 
-@pytest.mark.asyncio
 async def test_widget_scope_check_logic():
     """Widget scope check: None means all widgets, list means only those."""
     # None scoped_widget_ids = unrestricted
-    record = _make_api_key_record(scoped_widget_ids=None)
-    db = AsyncMock()
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = record
-    db.execute = AsyncMock(return_value=mock_result)
+    db = _mock_db(_APIKeyRecord(scoped_widget_ids=None))
 
     scope = await validate_api_key("sk_live_unscoped", db)
     assert scope["scoped_widget_ids"] is None
 
     # With scoped widget IDs
     widget_id = uuid4()
-    record2 = _make_api_key_record(scoped_widget_ids=[widget_id])
-    mock_result2 = MagicMock()
-    mock_result2.scalar_one_or_none.return_value = record2
-    db.execute = AsyncMock(return_value=mock_result2)
+    db = _mock_db(_APIKeyRecord(scoped_widget_ids=[widget_id]))
 
     scope2 = await validate_api_key("sk_live_scoped", db)
     assert widget_id in scope2["scoped_widget_ids"]
@@ -1,7 +1,7 @@
 """Execution cancellation endpoint tests."""
 
 import json
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, call
 from uuid import UUID
 
 import pytest
@@ -68,14 +68,24 @@ def _make_execution_record(
 EXEC_ID = "11111111-1111-1111-1111-111111111111"
 TENANT_A = "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
 TENANT_B = "cccccccc-cccc-cccc-cccc-cccccccccccc"
-
-
-async def test_cancel_running_execution_returns_202(
-    client: AsyncClient, mock_auth, override_redis, override_ws
+EXEC_ID_U = UUID(EXEC_ID)
+TENANT_A_U = UUID(TENANT_A)
+CANCELLED_STATUS_CALL = call(
+    tenant_id=TENANT_A_U,
+    execution_id=EXEC_ID_U,
+    node_id="__workflow__",
+    status="cancelled",
+)
+
+
+@pytest.mark.parametrize("state", ["running", "pending"])
+async def test_cancel_active_execution_returns_202(
+    client: AsyncClient, mock_auth, override_redis, override_ws, state
 ):
     redis = override_redis
+    ws = override_ws
     key = f"flowforge:{TENANT_A}:execution:{EXEC_ID}"
-    redis._store[key] = json.dumps(_make_execution_record(EXEC_ID, TENANT_A, "running"))
+    redis._store[key] = json.dumps(_make_execution_record(EXEC_ID, TENANT_A, state))
 
     response = await client.post(f"/api/v1/executions/{EXEC_ID}/cancel")
     assert response.status_code == 202
@@ -88,36 +98,8 @@ async def test_cancel_running_execution_returns_202(
     assert stored["status"] == "cancelled"
     assert stored["completed_at"] is not None
 
-
-async def test_cancel_pending_execution_returns_202(
-    client: AsyncClient, mock_auth, override_redis, override_ws
-):
-    redis = override_redis
-    key = f"flowforge:{TENANT_A}:execution:{EXEC_ID}"
-    redis._store[key] = json.dumps(_make_execution_record(EXEC_ID, TENANT_A, "pending"))
-
-    response = await client.post(f"/api/v1/executions/{EXEC_ID}/cancel")
-    assert response.status_code == 202
-    data = response.json()
-    assert data["status"] == "cancelled"
-
-
-async def test_cancel_publishes_websocket_status(
-    client: AsyncClient, mock_auth, override_redis, override_ws
-):
-    redis = override_redis
-    ws = override_ws
-    key = f"flowforge:{TENANT_A}:execution:{EXEC_ID}"
-    redis._store[key] = json.dumps(_make_execution_record(EXEC_ID, TENANT_A, "running"))
-
-    await client.post(f"/api/v1/executions/{EXEC_ID}/cancel")
-
-    ws.publish_execution_status.assert_awaited_once_with(
-        tenant_id=UUID(TENANT_A),
-        execution_id=UUID(EXEC_ID),
-        node_id="__workflow__",
-        status="cancelled",
-    )
+    # Verify the cancellation was pushed to WebSocket subscribers
+    assert ws.publish_execution_status.await_args_list == [CANCELLED_STATUS_CALL]
 
 
 async def test_cancel_completed_execution_returns_409(
@@ -38,8 +38,7 @@ async def _create_workflow(
         graph_json={"nodes": [], "edges": []},
     )
     db_session.add(wf)
-    await db_session.commit()
-    await db_session.refresh(wf)
+    await db_session.flush()
     return wf
 
 
@@ -62,8 +61,7 @@ async def _create_execution(
         error_message="something went wrong" if status == "failed" else None,
     )
     db_session.add(execution)
-    await db_session.commit()
-    await db_session.refresh(execution)
+    await db_session.flush()
     return execution
 
 
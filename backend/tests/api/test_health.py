@@ -1,20 +1,24 @@
-"""Health endpoint tests."""
+"""Health endpoint tests.
+
+/health and /health/live have no dependencies, so these use the bare
+http_client and never touch the test database.
+"""
 
 from httpx import AsyncClient
 
 
-async def test_health_check_returns_200(client: AsyncClient):
-    response = await client.get("/health")
+async def test_health_check_returns_200(http_client: AsyncClient):
+    response = await http_client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
 
 
-async def test_health_check_includes_service_name(client: AsyncClient):
-    response = await client.get("/health")
+async def test_health_check_includes_service_name(http_client: AsyncClient):
+    response = await http_client.get("/health")
     assert response.json()["service"] == "flowforge"
 
 
-async def test_liveness_returns_200(client: AsyncClient):
-    response = await client.get("/health/live")
+async def test_liveness_returns_200(http_client: AsyncClient):
+    response = await http_client.get("/health/live")
     assert response.status_code == 200
     assert response.json()["status"] == "live"
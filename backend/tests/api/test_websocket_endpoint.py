@@ -1,65 +1,103 @@
 """Tests for WebSocket endpoint."""
 
 import json
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
+from uuid import UUID
 
 from app.services.websocket_manager import WebSocketManager
 
+TENANT_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+EXEC_ID = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+WIDGET_ID = UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
+
+
+class FakeRedis:
+    """Minimal Redis stand-in that records published messages."""
+
+    def __init__(self):
+        self.published: list[tuple[str, bytes]] = []
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._pending: list[tuple[str, bytes]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    def publish(self, channel, message):
+        self._pending.append((channel, message))
+
+    async def execute(self):
+        self._redis.published.extend(self._pending)
+        self._pending.clear()
+
 
 class TestWebSocketManager:
     """Unit tests for the WebSocket manager itself (no network)."""
 
     async def test_publish_execution_status_includes_tenant(self):
         """Execution status messages publish to tenant-scoped channels."""
-        from uuid import UUID
-
-        mock_redis = MagicMock()
-        mock_redis.publish = AsyncMock()
+        mock_redis = FakeRedis()
         manager = WebSocketManager(mock_redis)
 
-        tenant_id = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
-        exec_id = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
-
         await manager.publish_execution_status(
-            tenant_id=tenant_id,
-            execution_id=exec_id,
+            tenant_id=TENANT_ID,
+            execution_id=EXEC_ID,
             node_id="node1",
             status="running",
         )
+        await manager.aclose()
 
-        mock_redis.publish.assert_awaited_once()
-        call_args = mock_redis.publish.call_args
-        channel = call_args[0][0]
-        assert f"flowforge:{tenant_id}:execution:{exec_id}" == channel
-        payload = json.loads(call_args[0][1])
-        assert payload["type"] == "execution_status"
-        assert payload["node_id"] == "node1"
-        assert payload["status"] == "running"
+        # Exactly one message per call, decoded end to end through the queue
+        assert len(mock_redis.published) == 1
+        assert (
+            mock_redis.published[0][0] == f"flowforge:{TENANT_ID}:execution:{EXEC_ID}"
+        )
+        payload = json.loads(mock_redis.published[0][1])
+        assert payload == {
+            "type": "execution_status",
+            "execution_id": str(EXEC_ID),
+            "node_id": "node1",
+            "status": "running",
+            "data": {},
+        }
 
     async def test_publish_live_data_includes_tenant(self):
         """Live data messages publish to tenant-scoped widget channels."""
-        from uuid import UUID
-
-        mock_redis = MagicMock()
-        mock_redis.publish = AsyncMock()
+        mock_redis = FakeRedis()
         manager = WebSocketManager(mock_redis)
 
-        tenant_id = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
-        widget_id = UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
-
         await manager.publish_live_data(
-            tenant_id=tenant_id,
-            widget_id=widget_id,
+            tenant_id=TENANT_ID,
+            widget_id=WIDGET_ID,
             data={"rows": [{"price": 150}]},
         )
-
-        mock_redis.publish.assert_awaited_once()
-        channel = mock_redis.publish.call_args[0][0]
-        assert f"flowforge:{tenant_id}:widget:{widget_id}" == channel
+        await manager.aclose()
+
+        # Exactly one message per call, decoded end to end through the queue
+        assert len(mock_redis.published) == 1
+        assert mock_redis.published[0][0] == f"flowforge:{TENANT_ID}:widget:{WIDGET_ID}"
+        payload = json.loads(mock_redis.published[0][1])
+        assert payload == {
+            "type": "live_data",
+            "widget_id": str(WIDGET_ID),
+            "data": {"rows": [{"price": 150}]},
+        }
 
     async def test_subscribe_and_unsubscribe_channels(self):
         """WebSocket can subscribe/unsubscribe to multiple channels."""
-        mock_redis = MagicMock()
+        mock_redis = FakeRedis()
         manager = WebSocketManager(mock_redis)
 
         mock_ws = AsyncMock()
@@ -75,7 +113,7 @@ class TestWebSocketManager:
 
     async def test_disconnect_all_removes_from_all_channels(self):
         """disconnect_all removes WebSocket from every channel."""
-        mock_redis = MagicMock()
+        mock_redis = FakeRedis()
         manager = WebSocketManager(mock_redis)
 
         mock_ws = AsyncMock()
@@ -87,10 +125,12 @@ class TestWebSocketManager:
         assert mock_ws not in manager._ws_channels
         assert mock_ws not in manager._connections.get("ch1", set())
         assert mock_ws not in manager._connections.get("ch2", set())
+        # Channels left without subscribers are dropped entirely
+        assert manager._connections == {}
 
     async def test_broadcast_to_channel_sends_to_all(self):
         """Broadcast sends messages to all connections on a channel."""
-        mock_redis = MagicMock()
+        mock_redis = FakeRedis()
         manager = WebSocketManager(mock_redis)
 
         ws1 = AsyncMock()
@@ -103,7 +143,7 @@ class TestWebSocketManager:
 
     async def test_broadcast_removes_dead_connections(self):
         """Dead connections are removed from the channel on send failure."""
-        mock_redis = MagicMock()
+        mock_redis = FakeRedis()
         manager = WebSocketManager(mock_redis)
 
         ws_good = AsyncMock()
@@ -117,7 +157,7 @@ class TestWebSocketManager:
 
     async def test_tenant_isolation_in_channels(self):
         """Messages on tenant A's channel don't reach tenant B."""
-        mock_redis = MagicMock()
+        mock_redis = FakeRedis()
         manager = WebSocketManager(mock_redis)
 
         ws_a = AsyncMock()
@@ -13,13 +13,16 @@ from app.models.workflow import Workflow
 
 
 def _make_claims(user_id: UUID, tenant_id: UUID, role: str = "analyst"):
+    # Built once per override; handlers treat claims as read-only
+    claims = {
+        "sub": str(user_id),
+        "tenant_id": str(tenant_id),
+        "realm_access": {"roles": [role]},
+        "resource_access": {},
+    }
+
     async def _claims():
-        return {
-            "sub": str(user_id),
-            "tenant_id": str(tenant_id),
-            "realm_access": {"roles": [role]},
-            "resource_access": {},
-        }
+        return claims
 
     return _claims
 
@@ -57,8 +60,7 @@ async def _create_workflow(
         },
     )
     db_session.add(wf)
-    await db_session.commit()
-    await db_session.refresh(wf)
+    await db_session.flush()
     return wf
 
 
@@ -203,6 +205,44 @@ async def test_import_workflow_creates_new_workflow(
         app.dependency_overrides.pop(get_user_claims, None)
 
 
+async def test_import_workflow_keeps_nodes_with_missing_or_duplicate_ids(
+    client: AsyncClient,
+    mock_auth,
+    seed_user_a,
+    tenant_id: UUID,
+    user_id: UUID,
+):
+    """Every imported node gets its own new ID, even if old IDs collide."""
+    app.dependency_overrides[get_user_claims] = _make_claims(user_id, tenant_id)
+    try:
+        import_payload = {
+            "metadata": {
+                "version": "1.0",
+                "exported_at": "2026-02-07T00:00:00Z",
+                "source_workflow_id": "00000000-0000-0000-0000-000000000099",
+            },
+            "name": "Malformed Import",
+            "graph_json": {
+                "nodes": [
+                    {"id": "dup", "type": "data_source"},
+                    {"id": "dup", "type": "filter"},
+                    {"type": "sort"},
+                    {"type": "select"},
+                ],
+                "edges": [],
+            },
+        }
+
+        response = await client.post("/api/v1/workflows/import", json=import_payload)
+        assert response.status_code == 201
+
+        nodes = response.json()["graph_json"]["nodes"]
+        assert [n["type"] for n in nodes] == ["data_source", "filter", "sort", "select"]
+        assert len({n["id"] for n in nodes}) == 4
+    finally:
+        app.dependency_overrides.pop(get_user_claims, None)
+
+
 async def test_import_workflow_logs_audit_event(
     client: AsyncClient,
     db_session: AsyncSession,
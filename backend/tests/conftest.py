@@ -4,16 +4,29 @@ All external stores (ClickHouse, Materialize, Redis) are mocked.
 Tests never require running instances of these services.
 """
 
+import asyncio
+import os
 from collections.abc import AsyncGenerator
 from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-
-from app.api.deps import get_db, get_schema_registry, get_websocket_manager
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import configure_mappers
+
+from app.api.deps import (
+    get_db,
+    get_schema_registry,
+    get_user_claims,
+    get_websocket_manager,
+)
 from app.core.auth import get_current_tenant_id, get_current_user_id
 from app.core.config import settings
 from app.core.database import Base
@@ -24,48 +37,145 @@ from app.models.user import User
 _async_base = settings.database.database_url
 TEST_DATABASE_URL = _async_base.rsplit("/", 1)[0] + "/flowforge_test"
 
-_sync_base = settings.database.database_url_sync
-TEST_DATABASE_URL_SYNC = _sync_base.rsplit("/", 1)[0] + "/flowforge_test"
+# Under pytest-xdist each worker (gw0, gw1, ...) gets its own schema so
+# parallel create_all/drop_all and test data never collide. Serial runs keep
+# using public.
+_xdist_worker = os.environ.get("PYTEST_XDIST_WORKER")
+TEST_SCHEMA = f"test_{_xdist_worker}" if _xdist_worker else "public"
 
-# Sync engine for DDL (create_all / drop_all) — avoids async event loop issues
-_ddl_engine = create_engine(TEST_DATABASE_URL_SYNC, echo=False)
 
+class _NullWsManager:
+    """Stand-in for WebSocketManager that drops every status update."""
 
-@pytest.fixture
-def setup_database():
-    """Create tables before tests, drop after. Uses sync engine for DDL."""
-    Base.metadata.create_all(_ddl_engine)
-    yield
-    Base.metadata.drop_all(_ddl_engine)
+    async def publish_execution_status(self, *args, **kwargs) -> None:
+        return None
 
 
-@pytest.fixture
-async def db_engine(setup_database):
-    """Provide a fresh async engine per test (avoids event-loop conflicts)."""
-    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+# Stateless, so one instance is shared by every test
+_NULL_WS_MANAGER = _NullWsManager()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on uvloop when it is installed (via uvicorn[standard])."""
+    try:
+        import uvloop
+    except ImportError:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _configure_mappers():
+    """Configure all ORM mappers up front.
+
+    SQLAlchemy does this lazily on first model use, which would otherwise land
+    in whichever test happens to run first and skew its timing.
+    """
+    from app import models  # noqa: F401 — registers every mapped class
+
+    configure_mappers()
+
+
+@pytest.fixture(scope="session")
+async def db_engine():
+    """One async engine, and so one connection pool, for the whole run.
+
+    All tests share the session event loop, so pooled asyncpg connections are
+    reused from test to test instead of reconnecting each time.
+    """
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        echo=False,
+        connect_args={"server_settings": {"search_path": TEST_SCHEMA}},
+    )
     yield engine
     await engine.dispose()
 
 
+@pytest.fixture(scope="session")
+async def setup_database(db_engine):
+    """Create this worker's schema and tables once per run, drop them at the end.
+
+    Not autouse — only tests that touch the database pay for the DDL. Per-test
+    isolation comes from the rolled-back outer transaction in db_connection.
+    Tables left behind by an aborted run are dropped first so the schema always
+    matches the current models.
+    """
+    async with db_engine.begin() as conn:
+        if TEST_SCHEMA != "public":
+            await conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{TEST_SCHEMA}"'))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with db_engine.begin() as conn:
+        if TEST_SCHEMA != "public":
+            await conn.execute(text(f'DROP SCHEMA IF EXISTS "{TEST_SCHEMA}" CASCADE'))
+        else:
+            await conn.run_sync(Base.metadata.drop_all)
+
+
 @pytest.fixture
-async def db_session(db_engine) -> AsyncGenerator[AsyncSession, None]:
+async def db_connection(
+    db_engine, setup_database
+) -> AsyncGenerator[AsyncConnection, None]:
+    """Hold one connection per test inside an outer transaction.
+
+    Every session bound to it joins via SAVEPOINT, so ``commit()`` calls in
+    tests and route handlers never escape — the outer transaction is rolled
+    back at teardown.
+    """
+    async with db_engine.connect() as conn:
+        trans = await conn.begin()
+        yield conn
+        await trans.rollback()
+
+
+@pytest.fixture
+def db_session_factory(db_connection) -> async_sessionmaker[AsyncSession]:
+    """Session factory bound to the per-test connection."""
+    return async_sessionmaker(
+        bind=db_connection,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+
+@pytest.fixture
+async def db_session(db_session_factory) -> AsyncGenerator[AsyncSession, None]:
     """Provide a test database session for direct use in tests."""
-    factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
-    async with factory() as session:
+    async with db_session_factory() as session:
         yield session
 
 
+@pytest.fixture(scope="session")
+async def http_client() -> AsyncGenerator[AsyncClient, None]:
+    """One AsyncClient for the whole run over an ASGITransport.
+
+    ASGITransport does not run the app lifespan, so no Redis/Materialize
+    connections are opened; per-test state lives in dependency overrides.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
 @pytest.fixture
-async def client(db_engine) -> AsyncGenerator[AsyncClient, None]:
+async def client(
+    db_session_factory, http_client: AsyncClient
+) -> AsyncGenerator[AsyncClient, None]:
     """Provide an httpx AsyncClient wired to the FastAPI test app.
 
-    The route handlers get their own sessions from the same engine,
-    so they can see committed data from db_session without sharing a connection.
+    Route handlers get their own sessions on the same connection as
+    db_session, so rows that tests only flush are visible to them.
+    Dependency overrides are restored to their pre-test state on teardown,
+    so overrides a test installs itself cannot leak into the next one.
     """
-    factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    saved_overrides = app.dependency_overrides.copy()
 
     async def override_get_db():
-        async with factory() as session:
+        async with db_session_factory() as session:
             try:
                 yield session
             finally:
@@ -73,11 +183,9 @@ async def client(db_engine) -> AsyncGenerator[AsyncClient, None]:
 
     app.dependency_overrides[get_db] = override_get_db
 
-    # Mock WebSocket manager so execution tests work
+    # Stub WebSocket manager so execution tests work
     # without app.state.ws_manager
-    mock_ws = MagicMock()
-    mock_ws.publish_execution_status = AsyncMock()
-    app.dependency_overrides[get_websocket_manager] = lambda: mock_ws
+    app.dependency_overrides[get_websocket_manager] = lambda: _NULL_WS_MANAGER
 
     # Mock schema registry to avoid real Redis/ClickHouse connections
     from app.schemas.schema import CatalogResponse
@@ -88,31 +196,46 @@ async def client(db_engine) -> AsyncGenerator[AsyncClient, None]:
     mock_registry.refresh = AsyncMock(return_value=empty_catalog)
     app.dependency_overrides[get_schema_registry] = lambda: mock_registry
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test",
-    ) as c:
-        yield c
-
-    # Only remove overrides — don't clear all (preserves mock_auth)
-    app.dependency_overrides.pop(get_db, None)
-    app.dependency_overrides.pop(get_websocket_manager, None)
-    app.dependency_overrides.pop(get_schema_registry, None)
+    try:
+        yield http_client
+    finally:
+        # Restore rather than clear — keeps overrides from fixtures such as
+        # mock_auth that were set up before this one
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(saved_overrides)
 
 
 @pytest.fixture
+def status_of(client: AsyncClient):
+    """Issue a request and return its status code without reading the body.
+
+    For tests that only assert on the status code.
+    """
+
+    async def _status_of(method: str, url: str, **kwargs) -> int:
+        async with client.stream(method, url, **kwargs) as response:
+            return response.status_code
+
+    return _status_of
+
+
+@pytest.fixture(scope="session")
 def tenant_id():
     return UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def user_id():
     return UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
 
 
 @pytest.fixture
 async def seed_user_a(db_session: AsyncSession, tenant_id, user_id):
-    """Create a test user for tenant A so FK constraints are satisfied."""
+    """Create a test user for tenant A so FK constraints are satisfied.
+
+    Only flushed — the row lives in the per-test transaction and is rolled
+    back with it.
+    """
     user = User(
         id=user_id,
         tenant_id=tenant_id,
@@ -120,7 +243,7 @@ async def seed_user_a(db_session: AsyncSession, tenant_id, user_id):
         full_name="Test User A",
     )
     db_session.add(user)
-    await db_session.commit()
+    await db_session.flush()
     return user
 
 
@@ -134,7 +257,7 @@ async def seed_user_b(db_session: AsyncSession, tenant_id_b, user_id_b):
         full_name="Test User B",
     )
     db_session.add(user)
-    await db_session.commit()
+    await db_session.flush()
     return user
 
 
@@ -149,12 +272,34 @@ def mock_auth(tenant_id, user_id):
 
 
 @pytest.fixture
+def mock_claims(request, tenant_id, user_id):
+    """Override JWT claims with a single realm role.
+
+    Select the role by parametrizing indirectly, e.g.
+    ``@pytest.mark.parametrize("mock_claims", ["viewer"], indirect=True)``.
+    """
+    claims = {
+        "sub": str(user_id),
+        "tenant_id": str(tenant_id),
+        "realm_access": {"roles": [request.param]},
+        "resource_access": {},
+    }
+
+    async def _claims():
+        return claims
+
+    app.dependency_overrides[get_user_claims] = _claims
+    yield
+    app.dependency_overrides.pop(get_user_claims, None)
+
+
+@pytest.fixture(scope="session")
 def tenant_id_b():
     """Second tenant for isolation tests."""
     return UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def user_id_b():
     """Second user for isolation tests."""
     return UUID("dddddddd-dddd-dddd-dddd-dddddddddddd")
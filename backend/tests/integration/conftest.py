@@ -0,0 +1,48 @@
+"""Fixtures shared by the integration suites.
+
+Clients are session-scoped so every module reuses one connection; each
+fixture skips its dependents when the service is not reachable.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def clickhouse_client():
+    """Provide a ClickHouse client, skip if unavailable."""
+    try:
+        import clickhouse_connect
+
+        client = clickhouse_connect.get_client(host="localhost", port=8123)
+        # Verify connection
+        result = client.query("SELECT 1")
+        if result.first_row[0] != 1:
+            pytest.skip("ClickHouse connection failed")
+    except Exception as e:
+        pytest.skip(f"ClickHouse not available: {e}")
+
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+async def mz_pool():
+    """Provide a small Materialize connection pool, skip if unavailable."""
+    try:
+        import asyncpg  # type: ignore[import-untyped]
+
+        pool = await asyncpg.create_pool(
+            host="localhost",
+            port=6875,
+            user="materialize",
+            database="materialize",
+            min_size=1,
+            max_size=2,
+        )
+    except Exception as e:
+        pytest.skip(f"Materialize not available: {e}")
+
+    try:
+        yield pool
+    finally:
+        await pool.close()
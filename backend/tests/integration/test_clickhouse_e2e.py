@@ -4,6 +4,8 @@ Requires a running ClickHouse instance at localhost:8123.
 Skipped automatically in regular CI; run with `pytest -m integration`.
 """
 
+from datetime import datetime
+
 import pytest
 
 from app.services.schema_engine import SchemaEngine
@@ -11,21 +13,21 @@ from app.services.workflow_compiler import WorkflowCompiler
 
 pytestmark = pytest.mark.integration
 
+TRADE_COLUMNS = ["trade_id", "symbol", "side", "price", "quantity", "trade_time"]
+SAMPLE_TRADES = [
+    ["t1", "AAPL", "BUY", 150.50, 100, datetime(2024, 1, 15, 10, 30)],
+    ["t2", "AAPL", "SELL", 151.00, 50, datetime(2024, 1, 15, 10, 31)],
+    ["t3", "MSFT", "BUY", 380.25, 200, datetime(2024, 1, 15, 10, 32)],
+    ["t4", "MSFT", "BUY", 381.00, 150, datetime(2024, 1, 15, 10, 33)],
+    ["t5", "GOOG", "BUY", 140.00, 300, datetime(2024, 1, 15, 10, 34)],
+    ["t6", "GOOG", "SELL", 141.50, 100, datetime(2024, 1, 15, 10, 35)],
+]
 
-@pytest.fixture(scope="module")
-def clickhouse_client():
-    """Provide a ClickHouse client, skip if unavailable."""
-    try:
-        import clickhouse_connect
 
-        client = clickhouse_connect.get_client(host="localhost", port=8123)
-        # Verify connection
-        result = client.query("SELECT 1")
-        if result.first_row[0] != 1:
-            pytest.skip("ClickHouse connection failed")
-        return client
-    except Exception as e:
-        pytest.skip(f"ClickHouse not available: {e}")
+@pytest.fixture(scope="module")
+def compiler():
+    """The compiler holds no per-compile state, so one instance serves the module."""
+    return WorkflowCompiler(schema_engine=SchemaEngine())
 
 
 @pytest.fixture(scope="module")
@@ -44,16 +46,12 @@ def sample_trades_table(clickhouse_client):
         ) ENGINE = Memory
     """)
 
-    # Insert sample data
-    clickhouse_client.command(f"""
-        INSERT INTO {table_name} VALUES
-        ('t1', 'AAPL', 'BUY', 150.50, 100, '2024-01-15 10:30:00'),
-        ('t2', 'AAPL', 'SELL', 151.00, 50, '2024-01-15 10:31:00'),
-        ('t3', 'MSFT', 'BUY', 380.25, 200, '2024-01-15 10:32:00'),
-        ('t4', 'MSFT', 'BUY', 381.00, 150, '2024-01-15 10:33:00'),
-        ('t5', 'GOOG', 'BUY', 140.00, 300, '2024-01-15 10:34:00'),
-        ('t6', 'GOOG', 'SELL', 141.50, 100, '2024-01-15 10:35:00')
-    """)
+    # Native insert: rows are sent column-encoded instead of parsed from SQL text
+    clickhouse_client.insert(
+        table_name,
+        data=SAMPLE_TRADES,
+        column_names=TRADE_COLUMNS,
+    )
 
     yield table_name
 
@@ -64,10 +62,10 @@ def sample_trades_table(clickhouse_client):
 class TestClickHouseE2E:
     """End-to-end tests executing compiled SQL against real ClickHouse."""
 
-    def test_compile_and_execute_filter(self, clickhouse_client, sample_trades_table):
+    def test_compile_and_execute_filter(
+        self, clickhouse_client, sample_trades_table, compiler
+    ):
         """Filter node correctly filters rows in ClickHouse."""
-        compiler = WorkflowCompiler(schema_engine=SchemaEngine())
-
         nodes = [
             {
                 "id": "src",
@@ -112,10 +110,10 @@ class TestClickHouseE2E:
         assert len(rows) == 2  # Only AAPL trades
         assert all(row["symbol"] == "AAPL" for row in rows)
 
-    def test_compile_and_execute_group_by(self, clickhouse_client, sample_trades_table):
+    def test_compile_and_execute_group_by(
+        self, clickhouse_client, sample_trades_table, compiler
+    ):
         """GroupBy node correctly aggregates in ClickHouse."""
-        compiler = WorkflowCompiler(schema_engine=SchemaEngine())
-
         nodes = [
             {
                 "id": "src",
@@ -168,11 +166,9 @@ class TestClickHouseE2E:
         assert rows["GOOG"] == 400
 
     def test_compile_and_execute_filter_then_sort(
-        self, clickhouse_client, sample_trades_table
+        self, clickhouse_client, sample_trades_table, compiler
     ):
         """Filter → Sort pipeline executes correctly."""
-        compiler = WorkflowCompiler(schema_engine=SchemaEngine())
-
         nodes = [
             {
                 "id": "src",
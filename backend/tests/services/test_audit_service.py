@@ -2,6 +2,7 @@
 
 from uuid import UUID, uuid4
 
+import pytest
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,6 +13,54 @@ TENANT_A = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
 TENANT_B = UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
 USER_A = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
 
+# (tenant, action, resource_type) for each seeded audit row
+AUDIT_SEED = {
+    "a_workflow_created": (TENANT_A, AuditAction.CREATED, AuditResourceType.WORKFLOW),
+    "a_dashboard_created": (
+        TENANT_A,
+        AuditAction.CREATED,
+        AuditResourceType.DASHBOARD,
+    ),
+    "a_workflow_deleted": (TENANT_A, AuditAction.DELETED, AuditResourceType.WORKFLOW),
+    "b_dashboard_created": (
+        TENANT_B,
+        AuditAction.CREATED,
+        AuditResourceType.DASHBOARD,
+    ),
+}
+
+
+async def _bulk_log(session: AsyncSession, entries: list[dict]) -> None:
+    """Insert audit rows directly in one flush, bypassing AuditService.log().
+
+    Use this for fixture data; test_log_creates_record covers the service path.
+    """
+    session.add_all(AuditLog(**entry) for entry in entries)
+    await session.flush()
+
+
+@pytest.fixture
+async def audit_seed(db_session: AsyncSession, setup_database) -> dict[str, UUID]:
+    """Insert one audit row per AUDIT_SEED entry.
+
+    Returns the resource_id of each row, keyed like AUDIT_SEED.
+    """
+    resource_ids = {key: uuid4() for key in AUDIT_SEED}
+    await _bulk_log(
+        db_session,
+        [
+            {
+                "tenant_id": tenant,
+                "user_id": USER_A,
+                "action": action,
+                "resource_type": resource_type,
+                "resource_id": resource_ids[key],
+            }
+            for key, (tenant, action, resource_type) in AUDIT_SEED.items()
+        ],
+    )
+    return resource_ids
+
 
 async def test_log_creates_record(db_session: AsyncSession, setup_database):
     """AuditService.log() persists an audit record."""
@@ -26,7 +75,7 @@ async def test_log_creates_record(db_session: AsyncSession, setup_database):
         resource_id=resource_id,
         metadata={"name": "Test Workflow"},
     )
-    await db_session.commit()
+    await db_session.flush()
 
     result = await db_session.execute(
         select(AuditLog).where(AuditLog.resource_id == resource_id)
@@ -39,86 +88,44 @@ async def test_log_creates_record(db_session: AsyncSession, setup_database):
     assert entry.metadata_ == {"name": "Test Workflow"}
 
 
-async def test_list_events_filters_by_tenant(db_session: AsyncSession, setup_database):
+async def test_list_events_filters_by_tenant(
+    db_session: AsyncSession, audit_seed: dict[str, UUID]
+):
     """list_events returns only records for the specified tenant."""
     service = AuditService(db_session)
-    resource_a = uuid4()
-    resource_b = uuid4()
 
-    await service.log(
-        tenant_id=TENANT_A,
-        user_id=USER_A,
-        action=AuditAction.CREATED,
-        resource_type=AuditResourceType.WORKFLOW,
-        resource_id=resource_a,
-    )
-    await service.log(
-        tenant_id=TENANT_B,
-        user_id=USER_A,
-        action=AuditAction.CREATED,
-        resource_type=AuditResourceType.DASHBOARD,
-        resource_id=resource_b,
-    )
-    await db_session.commit()
+    result_a = await service.list_events(tenant_id=TENANT_A)
+    assert result_a["total"] == 3
+    assert all(item.tenant_id == TENANT_A for item in result_a["items"])
 
-    result = await service.list_events(tenant_id=TENANT_A)
-    assert result["total"] == 1
-    assert result["items"][0].resource_id == resource_a
+    result_b = await service.list_events(tenant_id=TENANT_B)
+    assert result_b["total"] == 1
+    assert result_b["items"][0].resource_id == audit_seed["b_dashboard_created"]
 
 
 async def test_list_events_filters_by_resource_type(
-    db_session: AsyncSession, setup_database
+    db_session: AsyncSession, audit_seed: dict[str, UUID]
 ):
     """list_events can filter by resource_type."""
     service = AuditService(db_session)
 
-    await service.log(
-        tenant_id=TENANT_A,
-        user_id=USER_A,
-        action=AuditAction.CREATED,
-        resource_type=AuditResourceType.WORKFLOW,
-        resource_id=uuid4(),
-    )
-    await service.log(
-        tenant_id=TENANT_A,
-        user_id=USER_A,
-        action=AuditAction.CREATED,
-        resource_type=AuditResourceType.DASHBOARD,
-        resource_id=uuid4(),
-    )
-    await db_session.commit()
-
     result = await service.list_events(
         tenant_id=TENANT_A,
         resource_type=AuditResourceType.DASHBOARD,
     )
     assert result["total"] == 1
-    assert result["items"][0].resource_type == AuditResourceType.DASHBOARD
+    assert result["items"][0].resource_id == audit_seed["a_dashboard_created"]
 
 
-async def test_list_events_filters_by_action(db_session: AsyncSession, setup_database):
+async def test_list_events_filters_by_action(
+    db_session: AsyncSession, audit_seed: dict[str, UUID]
+):
     """list_events can filter by action."""
     service = AuditService(db_session)
 
-    await service.log(
-        tenant_id=TENANT_A,
-        user_id=USER_A,
-        action=AuditAction.CREATED,
-        resource_type=AuditResourceType.WORKFLOW,
-        resource_id=uuid4(),
-    )
-    await service.log(
-        tenant_id=TENANT_A,
-        user_id=USER_A,
-        action=AuditAction.DELETED,
-        resource_type=AuditResourceType.WORKFLOW,
-        resource_id=uuid4(),
-    )
-    await db_session.commit()
-
     result = await service.list_events(
         tenant_id=TENANT_A,
         action=AuditAction.DELETED,
     )
     assert result["total"] == 1
-    assert result["items"][0].action == AuditAction.DELETED
+    assert result["items"][0].resource_id == audit_seed["a_workflow_deleted"]
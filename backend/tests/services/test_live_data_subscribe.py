@@ -2,15 +2,28 @@
 and health-check mode switching."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import uuid4
+import itertools
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID
 
 import pytest
 
+from app.services import live_data_service
 from app.services.live_data_service import LiveDataService
 
+_uuid_counter = itertools.count(1)
 
-@pytest.fixture
+
+def _uid() -> UUID:
+    """Return a fresh, deterministic UUID — the tests only need uniqueness."""
+    return UUID(int=next(_uuid_counter))
+
+
+# The collaborator mocks below are never reconfigured or asserted on, so one
+# instance of each serves the whole module.
+
+
+@pytest.fixture(scope="module")
 def ws_manager():
     """Mock WebSocketManager with async publish_live_data."""
     mock = MagicMock()
@@ -18,7 +31,7 @@ def ws_manager():
     return mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def widget_data_service():
     """Mock WidgetDataService with async fetch_widget_data."""
     mock = MagicMock()
@@ -26,7 +39,7 @@ def widget_data_service():
     return mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def materialize_client():
     """Mock MaterializeClient with async ping and subscribe."""
     mock = MagicMock()
@@ -35,12 +48,48 @@ def materialize_client():
     return mock
 
 
-def _make_mock_task():
-    """Create a mock asyncio.Task."""
-    task = MagicMock(spec=asyncio.Task)
-    task.done.return_value = False
-    task.cancel.return_value = True
-    return task
+class _FakeTask:
+    """Minimal stand-in for asyncio.Task: never finishes, counts cancels.
+
+    Much cheaper to build than MagicMock(spec=asyncio.Task), which walks the
+    whole Task interface on every construction.
+    """
+
+    __slots__ = ("cancel_calls",)
+
+    def __init__(self) -> None:
+        self.cancel_calls = 0
+
+    def done(self) -> bool:
+        return False
+
+    def cancel(self) -> bool:
+        self.cancel_calls += 1
+        return True
+
+    def add_done_callback(self, fn) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def created_tasks(monkeypatch) -> list[_FakeTask]:
+    """Swap create_task for a _FakeTask factory and enable SUBSCRIBE.
+
+    Returns the list of fake tasks in creation order, for tests that need to
+    inspect one.
+    """
+    created: list[_FakeTask] = []
+
+    def _create_task(coro):
+        coro.close()  # never scheduled, so don't leave it un-awaited
+        created.append(_FakeTask())
+        return created[-1]
+
+    monkeypatch.setattr(live_data_service.asyncio, "create_task", _create_task)
+    monkeypatch.setattr(
+        live_data_service.settings.materialize, "materialize_subscribe_enabled", True
+    )
+    return created
 
 
 def _make_service(
@@ -60,153 +109,89 @@ def _make_service(
 class TestSubscribeWidgetModeSelection:
     """Tests for the initial mode selection in subscribe_widget."""
 
-    @patch("app.services.live_data_service.settings")
-    @patch("app.services.live_data_service.asyncio.create_task")
-    def test_subscribe_widget_poll_mode_when_materialize_unavailable(
-        self,
-        mock_create_task,
-        mock_settings,
-        ws_manager,
-        widget_data_service,
-        materialize_client,
-    ):
-        """When materialize is not available, subscribe_widget should use poll mode."""
-        mock_settings.materialize.materialize_subscribe_enabled = True
-        mock_create_task.return_value = _make_mock_task()
-        svc = _make_service(ws_manager, widget_data_service, materialize_client)
-        svc._running = True
-        # Materialize is NOT available
-        svc._materialize_available = False
-
-        widget_id = uuid4()
-        svc.subscribe_widget(
-            tenant_id=uuid4(),
-            widget_id=widget_id,
-            workflow_id=uuid4(),
-            view_name="live_positions",
-        )
-
-        sub = svc._subscriptions[widget_id]
-        assert sub.mode == "poll"
-        assert sub.task is not None
-
-    @patch("app.services.live_data_service.settings")
-    @patch("app.services.live_data_service.asyncio.create_task")
-    def test_subscribe_widget_subscribe_mode_when_materialize_available(
-        self,
-        mock_create_task,
-        mock_settings,
-        ws_manager,
-        widget_data_service,
-        materialize_client,
-    ):
-        """When materialize is available and view_name provided,
-        should use subscribe mode."""
-        mock_settings.materialize.materialize_subscribe_enabled = True
-        mock_create_task.return_value = _make_mock_task()
-        svc = _make_service(ws_manager, widget_data_service, materialize_client)
-        svc._running = True
-        svc._materialize_available = True
-
-        widget_id = uuid4()
-        svc.subscribe_widget(
-            tenant_id=uuid4(),
-            widget_id=widget_id,
-            workflow_id=uuid4(),
-            view_name="live_positions",
-        )
-
-        sub = svc._subscriptions[widget_id]
-        assert sub.mode == "subscribe"
-        # A shared view subscription should exist
-        assert "live_positions" in svc._view_subscriptions
-
-    @patch("app.services.live_data_service.settings")
-    @patch("app.services.live_data_service.asyncio.create_task")
-    def test_subscribe_widget_fallback_to_poll_without_view_name(
+    @pytest.mark.parametrize(
+        ("materialize_available", "view_name", "expected_mode"),
+        [
+            pytest.param(False, "live_positions", "poll", id="unavailable-poll"),
+            pytest.param(True, "live_positions", "subscribe", id="available-subscribe"),
+            pytest.param(True, None, "poll", id="no-view-poll"),
+        ],
+    )
+    def test_subscribe_widget_selects_mode(
         self,
-        mock_create_task,
-        mock_settings,
+        materialize_available,
+        view_name,
+        expected_mode,
         ws_manager,
         widget_data_service,
         materialize_client,
     ):
-        """Even with materialize available, no view_name means poll mode."""
-        mock_settings.materialize.materialize_subscribe_enabled = True
-        mock_create_task.return_value = _make_mock_task()
+        """SUBSCRIBE is used only when Materialize is up and the widget has a view."""
         svc = _make_service(ws_manager, widget_data_service, materialize_client)
         svc._running = True
-        svc._materialize_available = True
+        svc._materialize_available = materialize_available
 
-        widget_id = uuid4()
+        widget_id = _uid()
         svc.subscribe_widget(
-            tenant_id=uuid4(),
+            tenant_id=_uid(),
             widget_id=widget_id,
-            workflow_id=uuid4(),
-            view_name=None,
+            workflow_id=_uid(),
+            view_name=view_name,
         )
 
         sub = svc._subscriptions[widget_id]
-        assert sub.mode == "poll"
+        assert sub.mode == expected_mode
+        # Only subscribe mode opens a shared view subscription
+        assert bool(svc._view_subscriptions) == (expected_mode == "subscribe")
+        if expected_mode == "poll":
+            assert sub.task is not None
 
 
 class TestRefCounting:
     """Tests for shared view subscription reference counting."""
 
-    @patch("app.services.live_data_service.settings")
-    @patch("app.services.live_data_service.asyncio.create_task")
     def test_ref_counting_shared_view_subscription(
         self,
-        mock_create_task,
-        mock_settings,
         ws_manager,
         widget_data_service,
         materialize_client,
     ):
         """Two widgets on same view share one ViewSubscription, ref_count = 2."""
-        mock_settings.materialize.materialize_subscribe_enabled = True
-        mock_create_task.return_value = _make_mock_task()
         svc = _make_service(ws_manager, widget_data_service, materialize_client)
         svc._running = True
         svc._materialize_available = True
 
-        tenant_id = uuid4()
-        widget_a = uuid4()
-        widget_b = uuid4()
+        tenant_id = _uid()
+        widget_a = _uid()
+        widget_b = _uid()
         view_name = "live_positions"
 
-        svc.subscribe_widget(tenant_id, widget_a, uuid4(), view_name=view_name)
-        svc.subscribe_widget(tenant_id, widget_b, uuid4(), view_name=view_name)
+        svc.subscribe_widget(tenant_id, widget_a, _uid(), view_name=view_name)
+        svc.subscribe_widget(tenant_id, widget_b, _uid(), view_name=view_name)
 
         view_sub = svc._view_subscriptions[view_name]
         assert view_sub.ref_count == 2
         assert widget_a in view_sub.widget_ids
         assert widget_b in view_sub.widget_ids
 
-    @patch("app.services.live_data_service.settings")
-    @patch("app.services.live_data_service.asyncio.create_task")
     def test_unsubscribe_decrements_ref_count(
         self,
-        mock_create_task,
-        mock_settings,
         ws_manager,
         widget_data_service,
         materialize_client,
     ):
         """Unsubscribing one widget decrements ref_count."""
-        mock_settings.materialize.materialize_subscribe_enabled = True
-        mock_create_task.return_value = _make_mock_task()
         svc = _make_service(ws_manager, widget_data_service, materialize_client)
         svc._running = True
         svc._materialize_available = True
 
-        tenant_id = uuid4()
-        widget_a = uuid4()
-        widget_b = uuid4()
+        tenant_id = _uid()
+        widget_a = _uid()
+        widget_b = _uid()
         view_name = "live_positions"
 
-        svc.subscribe_widget(tenant_id, widget_a, uuid4(), view_name=view_name)
-        svc.subscribe_widget(tenant_id, widget_b, uuid4(), view_name=view_name)
+        svc.subscribe_widget(tenant_id, widget_a, _uid(), view_name=view_name)
+        svc.subscribe_widget(tenant_id, widget_b, _uid(), view_name=view_name)
 
         svc.unsubscribe_widget(widget_a)
 
@@ -215,64 +200,52 @@ class TestRefCounting:
         assert widget_a not in view_sub.widget_ids
         assert widget_b in view_sub.widget_ids
 
-    @patch("app.services.live_data_service.settings")
-    @patch("app.services.live_data_service.asyncio.create_task")
     def test_unsubscribe_last_widget_cancels_view_task(
         self,
-        mock_create_task,
-        mock_settings,
+        created_tasks,
         ws_manager,
         widget_data_service,
         materialize_client,
     ):
         """When ref_count reaches 0, the view task is cancelled
         and view sub is removed."""
-        mock_settings.materialize.materialize_subscribe_enabled = True
-        mock_task = _make_mock_task()
-        mock_create_task.return_value = mock_task
         svc = _make_service(ws_manager, widget_data_service, materialize_client)
         svc._running = True
         svc._materialize_available = True
 
-        tenant_id = uuid4()
-        widget_a = uuid4()
+        tenant_id = _uid()
+        widget_a = _uid()
         view_name = "live_positions"
 
-        svc.subscribe_widget(tenant_id, widget_a, uuid4(), view_name=view_name)
+        svc.subscribe_widget(tenant_id, widget_a, _uid(), view_name=view_name)
+        (view_task,) = created_tasks
 
-        # The task returned by create_task is already assigned to view_sub.task
         svc.unsubscribe_widget(widget_a)
 
-        mock_task.cancel.assert_called_once()
+        assert view_task.cancel_calls == 1
         assert view_name not in svc._view_subscriptions
 
 
 class TestHealthCheckModeSwitching:
     """Tests for _upgrade_to_subscribe and _downgrade_to_poll."""
 
-    @patch("app.services.live_data_service.settings")
-    @patch("app.services.live_data_service.asyncio.create_task")
     def test_health_check_upgrades_to_subscribe(
         self,
-        mock_create_task,
-        mock_settings,
         ws_manager,
         widget_data_service,
         materialize_client,
     ):
         """When materialize becomes available, poll-mode widgets
         with view_name switch to subscribe."""
-        mock_settings.materialize.materialize_subscribe_enabled = True
-        mock_create_task.return_value = _make_mock_task()
         svc = _make_service(ws_manager, widget_data_service, materialize_client)
         svc._running = True
         svc._materialize_available = False
 
-        tenant_id = uuid4()
-        widget_id = uuid4()
+        tenant_id = _uid()
+        widget_id = _uid()
 
         # Subscribe in poll mode (materialize not available yet)
-        svc.subscribe_widget(tenant_id, widget_id, uuid4(), view_name="live_pnl")
+        svc.subscribe_widget(tenant_id, widget_id, _uid(), view_name="live_pnl")
         assert svc._subscriptions[widget_id].mode == "poll"
 
         # Simulate materialize becoming available
@@ -282,29 +255,23 @@ class TestHealthCheckModeSwitching:
         assert svc._subscriptions[widget_id].mode == "subscribe"
         assert "live_pnl" in svc._view_subscriptions
 
-    @patch("app.services.live_data_service.settings")
-    @patch("app.services.live_data_service.asyncio.create_task")
     def test_health_check_downgrades_to_poll(
         self,
-        mock_create_task,
-        mock_settings,
         ws_manager,
         widget_data_service,
         materialize_client,
     ):
         """When materialize becomes unavailable,
         subscribe-mode widgets switch to poll."""
-        mock_settings.materialize.materialize_subscribe_enabled = True
-        mock_create_task.return_value = _make_mock_task()
         svc = _make_service(ws_manager, widget_data_service, materialize_client)
         svc._running = True
         svc._materialize_available = True
 
-        tenant_id = uuid4()
-        widget_id = uuid4()
+        tenant_id = _uid()
+        widget_id = _uid()
 
         # Subscribe in subscribe mode
-        svc.subscribe_widget(tenant_id, widget_id, uuid4(), view_name="live_pnl")
+        svc.subscribe_widget(tenant_id, widget_id, _uid(), view_name="live_pnl")
         assert svc._subscriptions[widget_id].mode == "subscribe"
         assert "live_pnl" in svc._view_subscriptions
 
@@ -317,51 +284,75 @@ class TestHealthCheckModeSwitching:
         # View subscriptions should be cleared
         assert len(svc._view_subscriptions) == 0
 
+    async def test_subscribe_failure_requests_health_check(
+        self,
+        monkeypatch,
+        ws_manager,
+        widget_data_service,
+    ):
+        """A failing SUBSCRIBE wakes the health check instead of waiting it out."""
+        monkeypatch.setattr(live_data_service, "POLL_INTERVAL", 0)
+        materialize = MagicMock()
+        svc = _make_service(ws_manager, widget_data_service, materialize)
+        svc._running = True
+
+        def _fail(view_name):
+            svc._running = False  # let the loop exit after one attempt
+            raise ConnectionError("Materialize down")
+
+        materialize.subscribe = MagicMock(side_effect=_fail)
+
+        await svc._subscribe_loop("live_pnl", _uid())
+
+        assert svc._health_check_requested.is_set()
+
 
 class TestStop:
     """Tests for the stop() method."""
 
-    @patch("app.services.live_data_service.settings")
-    @patch("app.services.live_data_service.asyncio.create_task")
-    def test_stop_cancels_all_tasks(
+    async def test_stop_cancels_all_tasks(
         self,
-        mock_create_task,
-        mock_settings,
+        monkeypatch,
         ws_manager,
         widget_data_service,
         materialize_client,
     ):
-        """stop() cancels all poll tasks, subscribe tasks, and health check task."""
-        mock_settings.materialize.materialize_subscribe_enabled = True
+        """stop() cancels and awaits every background task it has spawned."""
+
+        # stop() awaits the tasks it cancels, so these must be real futures
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future] = []
+
+        def _create_future(coro):
+            coro.close()
+            futures.append(loop.create_future())
+            return futures[-1]
 
-        # Return distinct mock tasks for each create_task call
-        poll_task = _make_mock_task()
-        subscribe_task = _make_mock_task()
-        mock_create_task.side_effect = [poll_task, subscribe_task]
+        monkeypatch.setattr(live_data_service.asyncio, "create_task", _create_future)
 
         svc = _make_service(ws_manager, widget_data_service, materialize_client)
         svc._running = True
         svc._materialize_available = True
 
-        tenant_id = uuid4()
+        tenant_id = _uid()
 
         # Create a poll-mode widget (no view_name)
-        poll_widget = uuid4()
-        svc.subscribe_widget(tenant_id, poll_widget, uuid4(), view_name=None)
+        poll_widget = _uid()
+        svc.subscribe_widget(tenant_id, poll_widget, _uid(), view_name=None)
 
         # Create a subscribe-mode widget
-        sub_widget = uuid4()
-        svc.subscribe_widget(tenant_id, sub_widget, uuid4(), view_name="live_pnl")
+        sub_widget = _uid()
+        svc.subscribe_widget(tenant_id, sub_widget, _uid(), view_name="live_pnl")
 
-        # Set up a mock health check task
-        health_task = _make_mock_task()
-        svc._health_check_task = health_task
+        # A health check task, and a loop orphaned by an earlier mode switch
+        svc._health_check_task = svc._spawn(asyncio.sleep(0))
+        svc._spawn(asyncio.sleep(0))
 
-        svc.stop()
+        await svc.stop()
 
-        poll_task.cancel.assert_called_once()
-        subscribe_task.cancel.assert_called_once()
-        health_task.cancel.assert_called_once()
+        # Poll task, shared SUBSCRIBE task, health check and the orphan
+        assert len(futures) == 4
+        assert all(f.cancelled() for f in futures)
         assert svc._running is False
         assert len(svc._subscriptions) == 0
         assert len(svc._view_subscriptions) == 0
@@ -1,11 +1,15 @@
 """Preview service tests — verify caching, compilation, and tenant isolation."""
 
 import json
+from datetime import datetime
+from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 
+import orjson
 import pytest
 
+from app.services import preview_service as preview_module
 from app.services.preview_service import CACHE_KEY_PREFIX, PreviewService
 from app.services.workflow_compiler import CompiledSegment
 
@@ -35,59 +39,98 @@ SAMPLE_NODES = [
 SAMPLE_EDGES = [{"source": "src", "target": "out"}]
 
 
-def _make_service(
-    *,
-    cache_get_return=None,
-    compile_return=None,
-    execute_return=None,
-) -> tuple[PreviewService, AsyncMock, AsyncMock, AsyncMock]:
-    """Create a PreviewService with mocked dependencies."""
-    mock_compiler = MagicMock()
-    mock_compiler._find_ancestors = MagicMock(return_value={"src"})
-    if compile_return is not None:
-        mock_compiler.compile_subgraph = MagicMock(return_value=compile_return)
-    else:
-        mock_compiler.compile_subgraph = MagicMock(
-            return_value=[
-                CompiledSegment(
-                    sql="SELECT symbol, price FROM fct_trades",
-                    dialect="clickhouse",
-                    target="clickhouse",
-                    source_node_ids=["src"],
-                )
-            ]
+DEFAULT_SEGMENTS = [
+    CompiledSegment(
+        sql="SELECT symbol, price FROM fct_trades",
+        dialect="clickhouse",
+        target="clickhouse",
+        source_node_ids=["src"],
+    )
+]
+
+
+@pytest.fixture(autouse=True)
+def _clear_segment_cache():
+    """The compiled-segment cache is process-wide; start each test empty."""
+    preview_module._segment_cache.clear()
+    yield
+    preview_module._segment_cache.clear()
+
+
+@pytest.fixture(scope="module")
+def compiler_proto() -> MagicMock:
+    """Module-wide compiler mock; preview_service resets it for each test."""
+    mock = MagicMock()
+    mock.compile_subgraph = MagicMock()
+    return mock
+
+
+@pytest.fixture(scope="module")
+def router_proto() -> AsyncMock:
+    """Module-wide query router mock; preview_service resets it for each test."""
+    mock = AsyncMock()
+    mock.execute_all = AsyncMock()
+    return mock
+
+
+@pytest.fixture(scope="module")
+def redis_proto() -> AsyncMock:
+    """Module-wide Redis mock; preview_service resets it for each test."""
+    mock = AsyncMock()
+    mock.get = AsyncMock()
+    mock.set = AsyncMock()
+    return mock
+
+
+@pytest.fixture
+def preview_service(compiler_proto, router_proto, redis_proto):
+    """Build a PreviewService over the module's mocks, reset for this test.
+
+    Keyword arguments: ``cache_get_return`` (a dict served as the cached
+    entry), ``compile_return`` (segments from compile_subgraph) and
+    ``execute_return`` (results from execute_all); each has a default.
+    Returns ``(service, compiler, router, redis)``.
+    """
+
+    def _preview_service(
+        *,
+        cache_get_return=None,
+        compile_return=None,
+        execute_return=None,
+    ) -> tuple[PreviewService, MagicMock, AsyncMock, AsyncMock]:
+        for mock in (compiler_proto, router_proto, redis_proto):
+            mock.reset_mock(return_value=True, side_effect=True)
+
+        compiler_proto.compile_subgraph.return_value = (
+            DEFAULT_SEGMENTS if compile_return is None else compile_return
         )
 
-    mock_router = AsyncMock()
-    if execute_return is not None:
-        mock_router.execute_all = AsyncMock(return_value=execute_return)
-    else:
-        result = MagicMock()
-        result.columns = ["symbol", "price"]
-        result.rows = [{"symbol": "AAPL", "price": 150.0}]
-        result.total_rows = 1
-        mock_router.execute_all = AsyncMock(return_value=[result])
-
-    mock_redis = AsyncMock()
-    if cache_get_return is not None:
-        mock_redis.get = AsyncMock(return_value=json.dumps(cache_get_return))
-    else:
-        mock_redis.get = AsyncMock(return_value=None)
-    mock_redis.set = AsyncMock()
-
-    service = PreviewService(
-        compiler=mock_compiler,
-        query_router=mock_router,
-        redis=mock_redis,
-    )
-    return service, mock_compiler, mock_router, mock_redis
+        if execute_return is None:
+            result = MagicMock()
+            result.columns = ["symbol", "price"]
+            result.rows = [{"symbol": "AAPL", "price": 150.0}]
+            result.total_rows = 1
+            execute_return = [result]
+        router_proto.execute_all.return_value = execute_return
+
+        redis_proto.get.return_value = (
+            None if cache_get_return is None else json.dumps(cache_get_return)
+        )
+
+        service = PreviewService(
+            compiler=compiler_proto,
+            query_router=router_proto,
+            redis=redis_proto,
+        )
+        return service, compiler_proto, router_proto, redis_proto
+
+    return _preview_service
 
 
 class TestPreviewExecution:
-    @pytest.mark.asyncio
-    async def test_preview_compiles_subgraph_and_returns_result(self):
+    async def test_preview_compiles_subgraph_and_returns_result(self, preview_service):
         """Preview compiles the subgraph and returns formatted result."""
-        service, mock_compiler, mock_router, mock_redis = _make_service()
+        service, mock_compiler, mock_router, mock_redis = preview_service()
 
         result = await service.execute_preview(
             tenant_id=TENANT_A,
@@ -103,10 +146,25 @@ class TestPreviewExecution:
         assert isinstance(result["rows"], list)
         assert "execution_ms" in result
 
-    @pytest.mark.asyncio
-    async def test_preview_empty_segments_returns_empty(self):
+    async def test_preview_next_page_reuses_compiled_segments(self, preview_service):
+        """Paging changes the Redis key but not the SQL, so compile runs once."""
+        service, mock_compiler, mock_router, _ = preview_service()
+
+        for offset in (0, 100):
+            await service.execute_preview(
+                tenant_id=TENANT_A,
+                target_node_id="out",
+                nodes=SAMPLE_NODES,
+                edges=SAMPLE_EDGES,
+                offset=offset,
+            )
+
+        mock_compiler.compile_subgraph.assert_called_once()
+        assert mock_router.execute_all.call_count == 2
+
+    async def test_preview_empty_segments_returns_empty(self, preview_service):
         """Preview with no compiled segments returns empty result."""
-        service, _, _, _ = _make_service(compile_return=[])
+        service, _, _, _ = preview_service(compile_return=[])
 
         result = await service.execute_preview(
             tenant_id=TENANT_A,
@@ -121,8 +179,7 @@ class TestPreviewExecution:
 
 
 class TestPreviewCaching:
-    @pytest.mark.asyncio
-    async def test_cache_hit_returns_cached_result(self):
+    async def test_cache_hit_returns_cached_result(self, preview_service):
         """When Redis has a cached result, skip compilation."""
         cached_data = {
             "columns": [{"name": "symbol", "dtype": "String"}],
@@ -132,7 +189,7 @@ class TestPreviewCaching:
             "offset": 0,
             "limit": 100,
         }
-        service, mock_compiler, mock_router, _ = _make_service(
+        service, mock_compiler, mock_router, _ = preview_service(
             cache_get_return=cached_data
         )
 
@@ -147,10 +204,9 @@ class TestPreviewCaching:
         mock_compiler.compile_subgraph.assert_not_called()
         mock_router.execute_all.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_cache_miss_executes_query(self):
+    async def test_cache_miss_executes_query(self, preview_service):
         """When Redis has no cached result, compile and execute."""
-        service, mock_compiler, mock_router, mock_redis = _make_service()
+        service, mock_compiler, mock_router, mock_redis = preview_service()
 
         result = await service.execute_preview(
             tenant_id=TENANT_A,
@@ -165,10 +221,57 @@ class TestPreviewCaching:
         # Result should be cached
         mock_redis.set.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_cache_key_includes_tenant_id(self):
+    async def test_cache_miss_caches_non_json_values(self, preview_service):
+        """Rows with datetime/Decimal values are still written to the cache."""
+        result = MagicMock()
+        result.columns = ["trade_time", "price"]
+        result.rows = [
+            {"trade_time": datetime(2024, 1, 15, 10, 30), "price": Decimal("1.5")}
+        ]
+        result.total_rows = 1
+        service, _, _, mock_redis = preview_service(execute_return=[result])
+
+        await service.execute_preview(
+            tenant_id=TENANT_A,
+            target_node_id="out",
+            nodes=SAMPLE_NODES,
+            edges=SAMPLE_EDGES,
+        )
+
+        mock_redis.get.return_value = mock_redis.set.call_args.args[1]
+        cached = await service._cache_get("any", cache_type="preview")
+        assert cached["rows"] == [{"trade_time": "2024-01-15T10:30:00", "price": "1.5"}]
+
+    async def test_cache_stores_rows_column_wise(self, preview_service):
+        """Cached rows carry each column name once and read back as dicts."""
+        result = MagicMock()
+        result.columns = ["symbol", "price"]
+        result.rows = [
+            {"symbol": "AAPL", "price": 150.0},
+            {"symbol": "MSFT", "price": 410.5},
+        ]
+        result.total_rows = 2
+        service, _, _, mock_redis = preview_service(execute_return=[result])
+
+        await service.execute_preview(
+            tenant_id=TENANT_A,
+            target_node_id="out",
+            nodes=SAMPLE_NODES,
+            edges=SAMPLE_EDGES,
+        )
+
+        payload = mock_redis.set.call_args.args[1]
+        assert orjson.loads(payload)["rows"] == {
+            "columns": ["symbol", "price"],
+            "data": [["AAPL", 150.0], ["MSFT", 410.5]],
+        }
+        mock_redis.get.return_value = payload
+        cached = await service._cache_get("any", cache_type="preview")
+        assert cached["rows"] == result.rows
+
+    async def test_cache_key_includes_tenant_id(self, preview_service):
         """Different tenants produce different cache keys."""
-        service, _, _, _ = _make_service()
+        service, _, _, _ = preview_service()
 
         key_a = service._compute_cache_key(TENANT_A, "out", SAMPLE_NODES, SAMPLE_EDGES)
         key_b = service._compute_cache_key(TENANT_B, "out", SAMPLE_NODES, SAMPLE_EDGES)
@@ -177,21 +280,29 @@ class TestPreviewCaching:
         assert key_a.startswith(CACHE_KEY_PREFIX)
         assert key_b.startswith(CACHE_KEY_PREFIX)
 
-    @pytest.mark.asyncio
-    async def test_same_tenant_same_config_produces_same_key(self):
+    async def test_same_tenant_same_config_produces_same_key(self, preview_service):
         """Same tenant + same graph config produces same cache key."""
-        service, _, _, _ = _make_service()
+        service, _, _, _ = preview_service()
 
         key1 = service._compute_cache_key(TENANT_A, "out", SAMPLE_NODES, SAMPLE_EDGES)
         key2 = service._compute_cache_key(TENANT_A, "out", SAMPLE_NODES, SAMPLE_EDGES)
 
         assert key1 == key2
 
-    @pytest.mark.asyncio
-    async def test_redis_failure_fails_open(self):
+    def test_graph_digest_accepts_integers_beyond_64_bits(self):
+        """Node config literals outside orjson's integer range still digest."""
+        nodes = [{"id": "a", "data": {"config": {"value": 2**70}}}]
+
+        digest = PreviewService._graph_digest("a", nodes, [])
+
+        assert digest == PreviewService._graph_digest("a", nodes, [])
+        other = [{"id": "a", "data": {"config": {"value": 2**70 + 1}}}]
+        assert digest != PreviewService._graph_digest("a", other, [])
+
+    async def test_redis_failure_fails_open(self, preview_service):
         """Redis error during cache read doesn't block preview."""
-        service, _, _, mock_redis = _make_service()
-        mock_redis.get = AsyncMock(side_effect=ConnectionError("Redis down"))
+        service, _, _, mock_redis = preview_service()
+        mock_redis.get.side_effect = ConnectionError("Redis down")
 
         result = await service.execute_preview(
             tenant_id=TENANT_A,
@@ -1,228 +1,234 @@
 """Query router tests — verify correct dispatch to backing stores."""
 
 import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.core.clickhouse import ClickHouseClient
+from app.core.materialize import MaterializeClient
 from app.services.query_router import QueryResult, QueryRouter
 from app.services.workflow_compiler import CompiledSegment
 
+# Default (sql, dialect) per target for segments built by _segment()
+_SEGMENT_DEFAULTS = {
+    "clickhouse": ("SELECT 1", "clickhouse"),
+    "materialize": ("SELECT * FROM live_positions", "postgres"),
+    "redis": ("", ""),
+}
+
+
+def _segment(target: str, **overrides) -> CompiledSegment:
+    """Build a single-node CompiledSegment for *target*; kwargs override fields."""
+    sql, dialect = _SEGMENT_DEFAULTS.get(target, ("SELECT 1", "clickhouse"))
+    fields = {
+        "sql": sql,
+        "dialect": dialect,
+        "target": target,
+        "source_node_ids": ["node1"],
+    }
+    fields.update(overrides)
+    return CompiledSegment(**fields)
+
+
+async def _never_returns(*args, **kwargs):
+    """Stand-in for a query that hangs until wait_for gives up on it."""
+    await asyncio.Event().wait()
+
+
+class _FakePipeline:
+    """Minimal stand-in for a redis-py pipeline: queues HGETALLs, counts executes.
+
+    Every execute() returns the same *results* batch.
+    """
+
+    __slots__ = ("calls", "results")
+
+    def __init__(self, results: list[dict]) -> None:
+        self.results = results
+        self.calls = 0
+
+    def hgetall(self, key: str) -> None:
+        pass
+
+    async def execute(self) -> list[dict]:
+        self.calls += 1
+        return self.results
+
+
+@pytest.fixture
+def ch_mock() -> AsyncMock:
+    """ClickHouseClient mock; spec_set rejects attributes the client lacks."""
+    return AsyncMock(spec_set=ClickHouseClient)
+
+
+@pytest.fixture
+def mz_mock() -> AsyncMock:
+    """MaterializeClient mock; spec_set rejects attributes the client lacks."""
+    return AsyncMock(spec_set=MaterializeClient)
 
-class TestRouting:
-    async def test_clickhouse_target_dispatches_to_clickhouse(self):
-        """Analytical queries route to ClickHouse and return QueryResult."""
-        mock_ch = MagicMock()
-        mock_ch.execute = AsyncMock(
-            return_value=[
-                {"trade_id": "t1", "symbol": "AAPL", "price": 150.0},
-                {"trade_id": "t2", "symbol": "GOOG", "price": 2800.0},
-            ]
-        )
 
-        router = QueryRouter(clickhouse=mock_ch)
-        segment = CompiledSegment(
-            sql="SELECT trade_id, symbol, price FROM fct_trades LIMIT 10",
-            dialect="clickhouse",
-            target="clickhouse",
-            source_node_ids=["node1"],
+@pytest.fixture
+def redis_mock() -> MagicMock:
+    """Redis mock with async get/scan; SCAN tests install a _FakePipeline.
+
+    Not spec'd — redis-py command methods aren't coroutine functions, so spec
+    wouldn't make them awaitable, and its large surface is slow to walk.
+    """
+    mock = MagicMock()
+    mock.get = AsyncMock()
+    mock.scan = AsyncMock()
+    return mock
+
+
+class TestRouting:
+    async def test_clickhouse_target_returns_columns_in_row_order(self, ch_mock):
+        """ClickHouse results keep column order and pass sql/params through."""
+        ch_mock.execute.return_value = [
+            {"trade_id": "t1", "symbol": "AAPL", "price": 150.0},
+            {"trade_id": "t2", "symbol": "GOOG", "price": 2800.0},
+        ]
+        router = QueryRouter(clickhouse=ch_mock)
+        segment = _segment(
+            "clickhouse", sql="SELECT trade_id, symbol, price FROM fct_trades LIMIT 10"
         )
         result = await router.execute(segment)
 
         assert isinstance(result, QueryResult)
-        assert result.source == "clickhouse"
-        assert result.total_rows == 2
         assert result.columns == ["trade_id", "symbol", "price"]
         assert len(result.rows) == 2
-        mock_ch.execute.assert_awaited_once_with(segment.sql, segment.params)
-
-    async def test_clickhouse_empty_result(self):
+        ch_mock.execute.assert_awaited_once_with(segment.sql, segment.params)
+
+    @pytest.mark.parametrize(
+        ("target", "params", "rows"),
+        [
+            pytest.param(
+                "clickhouse",
+                {},
+                [{"symbol": "AAPL", "price": 150.0}, {"symbol": "GOOG", "price": 2.0}],
+                id="clickhouse",
+            ),
+            pytest.param(
+                "materialize",
+                {},
+                [{"symbol": "AAPL", "position": 100}],
+                id="materialize",
+            ),
+            pytest.param(
+                "redis",
+                {"key": "quote:AAPL"},
+                [{"symbol": "AAPL", "price": 150.0}],
+                id="redis",
+            ),
+        ],
+    )
+    async def test_target_dispatches_to_its_store(
+        self, target, params, rows, ch_mock, mz_mock, redis_mock
+    ):
+        """Each target routes to its own backing store and tags the result."""
+        sql_clients = {"clickhouse": ch_mock, "materialize": mz_mock}
+        if target == "redis":
+            redis_mock.get.return_value = json.dumps(rows[0])
+        else:
+            sql_clients[target].execute.return_value = rows
+        router = QueryRouter(clickhouse=ch_mock, materialize=mz_mock, redis=redis_mock)
+
+        result = await router.execute(_segment(target, params=params))
+
+        assert result.source == target
+        assert result.total_rows == len(rows)
+        assert result.rows == rows
+
+    async def test_clickhouse_empty_result(self, ch_mock):
         """ClickHouse returning empty rows produces empty QueryResult."""
-        mock_ch = MagicMock()
-        mock_ch.execute = AsyncMock(return_value=[])
-
-        router = QueryRouter(clickhouse=mock_ch)
-        segment = CompiledSegment(
-            sql="SELECT * FROM fct_trades WHERE 1=0",
-            dialect="clickhouse",
-            target="clickhouse",
-            source_node_ids=["node1"],
+        ch_mock.execute.return_value = []
+        router = QueryRouter(clickhouse=ch_mock)
+
+        result = await router.execute(
+            _segment("clickhouse", sql="SELECT * FROM fct_trades WHERE 1=0")
         )
-        result = await router.execute(segment)
 
         assert result.source == "clickhouse"
         assert result.total_rows == 0
         assert result.columns == []
         assert result.rows == []
 
-    async def test_clickhouse_not_configured_raises(self):
-        """ClickHouse target without client raises RuntimeError."""
-        router = QueryRouter(clickhouse=None)
-        segment = CompiledSegment(
-            sql="SELECT 1",
-            dialect="clickhouse",
-            target="clickhouse",
-            source_node_ids=["node1"],
-        )
-        with pytest.raises(RuntimeError, match="ClickHouse client not configured"):
-            await router.execute(segment)
-
-    async def test_materialize_target_dispatches_to_materialize(self):
-        """Live data queries route to Materialize and return QueryResult."""
-        mock_mz = MagicMock()
-        mock_mz.execute = AsyncMock(return_value=[{"symbol": "AAPL", "position": 100}])
-        router = QueryRouter(materialize=mock_mz)
-        segment = CompiledSegment(
-            sql="SELECT * FROM positions",
-            dialect="postgres",
-            target="materialize",
-            source_node_ids=["node1"],
-        )
-        result = await router.execute(segment)
-        assert result.source == "materialize"
-        assert result.total_rows == 1
-
-    async def test_materialize_not_configured_raises(self):
-        """Materialize target without client raises RuntimeError."""
+    @pytest.mark.parametrize(
+        ("target", "message"),
+        [
+            ("clickhouse", "ClickHouse client not configured"),
+            ("materialize", "Materialize client not configured"),
+            ("redis", "Redis client not configured"),
+        ],
+    )
+    async def test_target_not_configured_raises(self, target, message):
+        """A target whose client was not provided raises RuntimeError."""
         router = QueryRouter()
-        segment = CompiledSegment(
-            sql="SELECT * FROM positions",
-            dialect="postgres",
-            target="materialize",
-            source_node_ids=["node1"],
-        )
-        with pytest.raises(RuntimeError, match="Materialize client not configured"):
-            await router.execute(segment)
-
-    async def test_redis_target_dispatches_to_redis(self):
-        """Point lookups route to Redis and return QueryResult."""
-        mock_redis = MagicMock()
-        mock_redis.get = AsyncMock(return_value='{"symbol": "AAPL", "price": 150.0}')
-        router = QueryRouter(redis=mock_redis)
-        segment = CompiledSegment(
-            sql="",
-            dialect="",
-            target="redis",
-            source_node_ids=["node1"],
-            params={"key": "quote:AAPL"},
-        )
-        result = await router.execute(segment)
-        assert result.source == "redis"
-        assert result.total_rows == 1
-        assert result.rows[0]["symbol"] == "AAPL"
-
-    async def test_redis_not_configured_raises(self):
-        """Redis target without client raises RuntimeError."""
-        router = QueryRouter()
-        segment = CompiledSegment(
-            sql="",
-            dialect="",
-            target="redis",
-            source_node_ids=["node1"],
-            params={"key": "quote:AAPL"},
-        )
-        with pytest.raises(RuntimeError, match="Redis client not configured"):
-            await router.execute(segment)
+        with pytest.raises(RuntimeError, match=message):
+            await router.execute(_segment(target, params={"key": "quote:AAPL"}))
 
     async def test_unknown_target_raises(self):
         """Unknown target raises ValueError."""
         router = QueryRouter()
-        segment = CompiledSegment(
-            sql="SELECT 1",
-            dialect="clickhouse",
-            target="unknown_store",
-            source_node_ids=["node1"],
-        )
         with pytest.raises(ValueError, match="Unknown target"):
-            await router.execute(segment)
+            await router.execute(_segment("unknown_store"))
 
 
 class TestTimeouts:
     """Test query timeout enforcement for ClickHouse and Materialize."""
 
     @patch("app.services.query_router.settings")
-    async def test_clickhouse_timeout_raises(self, mock_settings):
+    async def test_clickhouse_timeout_raises(self, mock_settings, ch_mock):
         """ClickHouse query exceeding timeout raises TimeoutError."""
-        mock_settings.preview.clickhouse_query_timeout = 1
-
-        async def slow_query(*args, **kwargs):
-            await asyncio.sleep(2)
-            return [{"result": "never reached"}]
-
-        mock_ch = MagicMock()
-        mock_ch.execute = slow_query
-        router = QueryRouter(clickhouse=mock_ch)
-        segment = CompiledSegment(
-            sql="SELECT * FROM large_table",
-            dialect="clickhouse",
-            target="clickhouse",
-            source_node_ids=["node1"],
-        )
+        mock_settings.preview.clickhouse_query_timeout = 0.01
+
+        ch_mock.execute.side_effect = _never_returns
+        router = QueryRouter(clickhouse=ch_mock)
         with pytest.raises(TimeoutError, match="ClickHouse query exceeded timeout"):
-            await router.execute(segment)
+            await router.execute(
+                _segment("clickhouse", sql="SELECT * FROM large_table")
+            )
 
     @patch("app.services.query_router.settings")
-    async def test_clickhouse_fast_query_succeeds(self, mock_settings):
+    async def test_clickhouse_fast_query_succeeds(self, mock_settings, ch_mock):
         """ClickHouse query completing within timeout succeeds."""
         mock_settings.preview.clickhouse_query_timeout = 5
 
         async def fast_query(*args, **kwargs):
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(0)
             return [{"symbol": "AAPL"}]
 
-        mock_ch = MagicMock()
-        mock_ch.execute = fast_query
-        router = QueryRouter(clickhouse=mock_ch)
-        segment = CompiledSegment(
-            sql="SELECT * FROM quick_table",
-            dialect="clickhouse",
-            target="clickhouse",
-            source_node_ids=["node1"],
+        ch_mock.execute.side_effect = fast_query
+        router = QueryRouter(clickhouse=ch_mock)
+        result = await router.execute(
+            _segment("clickhouse", sql="SELECT * FROM quick_table")
         )
-        result = await router.execute(segment)
         assert result.source == "clickhouse"
         assert result.total_rows == 1
 
     @patch("app.services.query_router.settings")
-    async def test_materialize_timeout_raises(self, mock_settings):
+    async def test_materialize_timeout_raises(self, mock_settings, mz_mock):
         """Materialize query exceeding timeout raises TimeoutError."""
-        mock_settings.preview.materialize_query_timeout = 1
-
-        async def slow_query(*args, **kwargs):
-            await asyncio.sleep(2)
-            return [{"result": "never reached"}]
-
-        mock_mz = MagicMock()
-        mock_mz.execute = slow_query
-        router = QueryRouter(materialize=mock_mz)
-        segment = CompiledSegment(
-            sql="SELECT * FROM live_positions",
-            dialect="postgres",
-            target="materialize",
-            source_node_ids=["node1"],
-        )
+        mock_settings.preview.materialize_query_timeout = 0.01
+
+        mz_mock.execute.side_effect = _never_returns
+        router = QueryRouter(materialize=mz_mock)
         with pytest.raises(TimeoutError, match="Materialize query exceeded timeout"):
-            await router.execute(segment)
+            await router.execute(_segment("materialize"))
 
     @patch("app.services.query_router.settings")
-    async def test_materialize_fast_query_succeeds(self, mock_settings):
+    async def test_materialize_fast_query_succeeds(self, mock_settings, mz_mock):
         """Materialize query completing within timeout succeeds."""
         mock_settings.preview.materialize_query_timeout = 5
 
         async def fast_query(*args, **kwargs):
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(0)
             return [{"symbol": "AAPL", "position": 100}]
 
-        mock_mz = MagicMock()
-        mock_mz.execute = fast_query
-        router = QueryRouter(materialize=mock_mz)
-        segment = CompiledSegment(
-            sql="SELECT * FROM live_positions",
-            dialect="postgres",
-            target="materialize",
-            source_node_ids=["node1"],
-        )
-        result = await router.execute(segment)
+        mz_mock.execute.side_effect = fast_query
+        router = QueryRouter(materialize=mz_mock)
+        result = await router.execute(_segment("materialize"))
         assert result.source == "materialize"
         assert result.total_rows == 1
 
@@ -230,136 +236,103 @@ class TestTimeouts:
 class TestRedisPipelining:
     """Test Redis SCAN_HASH with key limits and pipelining."""
 
+    @staticmethod
+    def _scan_segment() -> CompiledSegment:
+        """A fresh SCAN_HASH segment, so no test shares another's params dict."""
+        return _segment(
+            "redis", params={"lookup_type": "SCAN_HASH", "pattern": "latest:vwap:*"}
+        )
+
     @patch("app.services.query_router.settings")
-    async def test_redis_scan_hash_respects_key_limit(self, mock_settings):
+    async def test_redis_scan_hash_respects_key_limit(self, mock_settings, redis_mock):
         """SCAN_HASH stops at configured key limit."""
         mock_settings.redis_scan_limit = 50
         mock_settings.redis_pipeline_batch_size = 10
 
-        # Simulate SCAN returning 100 keys total
-        mock_redis = MagicMock()
-        scan_results = [
-            (1, [f"latest:vwap:SYM{i:03d}" for i in range(25)]),
-            (2, [f"latest:vwap:SYM{i:03d}" for i in range(25, 50)]),
-            (3, [f"latest:vwap:SYM{i:03d}" for i in range(50, 75)]),
-            (0, [f"latest:vwap:SYM{i:03d}" for i in range(75, 100)]),
-        ]
-        mock_redis.scan = AsyncMock(side_effect=scan_results)
-
-        # Mock pipeline
-        mock_pipeline = MagicMock()
-        mock_pipeline.execute = AsyncMock(return_value=[{"price": "150.0"}] * 10)
-        mock_redis.pipeline.return_value = mock_pipeline
-
-        router = QueryRouter(redis=mock_redis)
-        segment = CompiledSegment(
-            sql="",
-            dialect="",
-            target="redis",
-            source_node_ids=["node1"],
-            params={"lookup_type": "SCAN_HASH", "pattern": "latest:vwap:*"},
+        # Simulate SCAN returning 100 keys total, 25 per page. Only the page
+        # sequence matters, so a plain coroutine stands in for AsyncMock.
+        pages = iter(
+            [
+                (cursor, [f"latest:vwap:SYM{i:03d}" for i in range(start, start + 25)])
+                for cursor, start in ((1, 0), (2, 25), (3, 50), (0, 75))
+            ]
         )
-        result = await router.execute(segment)
+
+        async def scan(*args, **kwargs):
+            return next(pages)
+
+        redis_mock.scan = scan
+        pipe = _FakePipeline([{"price": "150.0"}] * 10)
+        redis_mock.pipeline.return_value = pipe
+
+        router = QueryRouter(redis=redis_mock)
+        result = await router.execute(self._scan_segment())
 
         # Should process only 50 keys, not all 100
         assert result.total_rows == 50
+        # ...and stop scanning once the limit is reached
+        assert len(list(pages)) == 2
         # 50 keys / 10 per batch = 5 pipeline calls
-        assert mock_pipeline.execute.await_count == 5
+        assert pipe.calls == 5
 
     @patch("app.services.query_router.settings")
-    async def test_redis_scan_hash_uses_pipelining(self, mock_settings):
+    async def test_redis_scan_hash_uses_pipelining(self, mock_settings, redis_mock):
         """SCAN_HASH batches HGETALL calls via pipeline."""
         mock_settings.redis_scan_limit = 1000
         mock_settings.redis_pipeline_batch_size = 5
 
-        mock_redis = MagicMock()
         # SCAN returns 15 keys total (3 batches of 5)
-        mock_redis.scan = AsyncMock(
-            return_value=(0, [f"latest:vwap:SYM{i}" for i in range(15)])
+        redis_mock.scan.return_value = (
+            0,
+            [f"latest:vwap:SYM{i}" for i in range(15)],
         )
+        pipe = _FakePipeline([{"price": f"{i}.0"} for i in range(5)])
+        redis_mock.pipeline.return_value = pipe
 
-        # Mock pipeline
-        mock_pipeline = MagicMock()
-        mock_pipeline.execute = AsyncMock(
-            return_value=[{"price": f"{i}.0"} for i in range(5)]
-        )
-        mock_redis.pipeline.return_value = mock_pipeline
-
-        router = QueryRouter(redis=mock_redis)
-        segment = CompiledSegment(
-            sql="",
-            dialect="",
-            target="redis",
-            source_node_ids=["node1"],
-            params={"lookup_type": "SCAN_HASH", "pattern": "latest:vwap:*"},
-        )
-        result = await router.execute(segment)
+        router = QueryRouter(redis=redis_mock)
+        result = await router.execute(self._scan_segment())
 
         # 15 keys / 5 per batch = 3 pipeline calls
-        assert mock_pipeline.execute.await_count == 3
+        assert pipe.calls == 3
         assert result.total_rows == 15
 
     @patch("app.services.query_router.settings")
-    async def test_redis_scan_hash_extracts_symbol_from_key(self, mock_settings):
+    async def test_redis_scan_hash_extracts_symbol_from_key(
+        self, mock_settings, redis_mock
+    ):
         """SCAN_HASH correctly extracts symbol from key name."""
         mock_settings.redis_scan_limit = 1000
         mock_settings.redis_pipeline_batch_size = 10
 
-        mock_redis = MagicMock()
-        mock_redis.scan = AsyncMock(
-            return_value=(0, ["latest:vwap:AAPL", "latest:vwap:GOOG"])
-        )
-
-        # Mock pipeline
-        mock_pipeline = MagicMock()
-        mock_pipeline.execute = AsyncMock(
-            return_value=[
+        redis_mock.scan.return_value = (0, ["latest:vwap:AAPL", "latest:vwap:GOOG"])
+        redis_mock.pipeline.return_value = _FakePipeline(
+            [
                 {"price": "150.0", "volume": "1000"},
                 {"price": "2800.0", "volume": "500"},
             ]
         )
-        mock_redis.pipeline.return_value = mock_pipeline
-
-        router = QueryRouter(redis=mock_redis)
-        segment = CompiledSegment(
-            sql="",
-            dialect="",
-            target="redis",
-            source_node_ids=["node1"],
-            params={"lookup_type": "SCAN_HASH", "pattern": "latest:vwap:*"},
-        )
-        result = await router.execute(segment)
+
+        router = QueryRouter(redis=redis_mock)
+        result = await router.execute(self._scan_segment())
 
         assert result.total_rows == 2
-        # Check symbol extraction
-        symbols = {row["symbol"] for row in result.rows}
-        assert symbols == {"AAPL", "GOOG"}
+        # Symbols come from the key suffix, in SCAN order
+        assert [row["symbol"] for row in result.rows] == ["AAPL", "GOOG"]
 
     @patch("app.services.query_router.settings")
-    async def test_redis_scan_hash_handles_empty_hashes(self, mock_settings):
+    async def test_redis_scan_hash_handles_empty_hashes(
+        self, mock_settings, redis_mock
+    ):
         """SCAN_HASH skips keys with empty hash data."""
         mock_settings.redis_scan_limit = 1000
         mock_settings.redis_pipeline_batch_size = 10
 
-        mock_redis = MagicMock()
-        mock_redis.scan = AsyncMock(
-            return_value=(0, ["latest:vwap:AAPL", "latest:vwap:EMPTY"])
-        )
+        redis_mock.scan.return_value = (0, ["latest:vwap:AAPL", "latest:vwap:EMPTY"])
+        # Second hash is empty
+        redis_mock.pipeline.return_value = _FakePipeline([{"price": "150.0"}, {}])
 
-        # Mock pipeline — second hash is empty
-        mock_pipeline = MagicMock()
-        mock_pipeline.execute = AsyncMock(return_value=[{"price": "150.0"}, {}])
-        mock_redis.pipeline.return_value = mock_pipeline
-
-        router = QueryRouter(redis=mock_redis)
-        segment = CompiledSegment(
-            sql="",
-            dialect="",
-            target="redis",
-            source_node_ids=["node1"],
-            params={"lookup_type": "SCAN_HASH", "pattern": "latest:vwap:*"},
-        )
-        result = await router.execute(segment)
+        router = QueryRouter(redis=redis_mock)
+        result = await router.execute(self._scan_segment())
 
         # Only one non-empty hash
         assert result.total_rows == 1
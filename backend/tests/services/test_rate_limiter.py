@@ -30,7 +30,6 @@ def _make_limiter(incr_return=1, redis_fail=False):
 # ── Tests ─────────────────────────────────────────────────────────────────
 
 
-@pytest.mark.asyncio
 async def test_under_limit_passes():
     """Requests under the limit should not raise."""
     limiter = _make_limiter(incr_return=1)
@@ -38,7 +37,6 @@ async def test_under_limit_passes():
     await limiter.check("test_key_hash", limit=100)
 
 
-@pytest.mark.asyncio
 async def test_over_limit_raises_rate_limit_exceeded():
     """Requests over the limit should raise RateLimitExceededError with retry_after."""
     limiter = _make_limiter(incr_return=101)
@@ -49,7 +47,6 @@ async def test_over_limit_raises_rate_limit_exceeded():
     assert exc_info.value.retry_after > 0
 
 
-@pytest.mark.asyncio
 async def test_redis_failure_fails_open():
     """Redis errors should not block requests."""
     limiter = _make_limiter(redis_fail=True)
@@ -57,7 +54,6 @@ async def test_redis_failure_fails_open():
     await limiter.check("test_key_hash", limit=100)
 
 
-@pytest.mark.asyncio
 async def test_custom_limit_override():
     """Custom limit should be used instead of the default."""
     limiter = _make_limiter(incr_return=6)
@@ -71,7 +67,6 @@ async def test_custom_limit_override():
     await limiter2.check("test_key_hash", limit=10)
 
 
-@pytest.mark.asyncio
 async def test_first_request_sets_expire():
     """First request in a window (count=1) should set an expiry on the key."""
     limiter = _make_limiter(incr_return=1)
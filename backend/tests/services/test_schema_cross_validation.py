@@ -5,9 +5,11 @@ SchemaEngine.validate_dag() produces identical output schemas.
 The TypeScript engine runs the same fixtures in a parallel test.
 """
 
-import json
+import os
+from operator import itemgetter
 from pathlib import Path
 
+import orjson
 import pytest
 
 from app.services.schema_engine import SchemaEngine
@@ -21,39 +23,48 @@ FIXTURES_DIR = (
 
 engine = SchemaEngine()
 
-
-def _load_fixtures() -> list[tuple[str, dict]]:
-    """Load all JSON fixture files from the fixtures directory."""
-    fixtures = []
-    for path in sorted(FIXTURES_DIR.glob("*.json")):
-        with open(path) as f:
-            data = json.load(f)
-        fixtures.append((path.stem, data))
-    return fixtures
+# Only these column fields are compared against fixtures
+_COMPARED_FIELDS = ("name", "dtype", "nullable")
+_COMPARED_FIELD_SET = set(_COMPARED_FIELDS)
+_get_compared = itemgetter(*_COMPARED_FIELDS)
 
 
 def _schema_to_comparable(schema_list: list) -> list[dict]:
     """Normalize schema output for comparison.
 
-    Converts Pydantic models to dicts and standardizes keys.
+    Accepts ColumnSchema models or plain dicts (decided once, from the first
+    item) and keeps only name, dtype and nullable.
+    """
+    if not schema_list:
+        return []
+    if isinstance(schema_list[0], dict):
+        return [
+            dict(zip(_COMPARED_FIELDS, _get_compared(item), strict=True))
+            for item in schema_list
+        ]
+    return [item.model_dump(include=_COMPARED_FIELD_SET) for item in schema_list]
+
+
+def _load_fixtures() -> list[tuple[str, dict, dict[str, list[dict]]]]:
+    """Load all JSON fixture files from the fixtures directory, sorted by name.
+
+    Each entry is (name, data, expected_map): the expected schemas are
+    normalized once here rather than on every test run.
     """
-    result = []
-    for item in schema_list:
-        if hasattr(item, "model_dump"):
-            d = item.model_dump()
-        elif isinstance(item, dict):
-            d = item
-        else:
-            d = {"name": str(item)}
-        # Only compare name, dtype, nullable
-        result.append(
-            {
-                "name": d["name"],
-                "dtype": d["dtype"],
-                "nullable": d["nullable"],
-            }
+    with os.scandir(FIXTURES_DIR) as it:
+        entries = sorted(
+            (e for e in it if e.name.endswith(".json")), key=lambda e: e.name
         )
-    return result
+    fixtures = []
+    for entry in entries:
+        with open(entry.path, "rb") as f:
+            data = orjson.loads(f.read())
+        expected_map = {
+            node_id: _schema_to_comparable(schema)
+            for node_id, schema in data["expected"].items()
+        }
+        fixtures.append((entry.name.removesuffix(".json"), data, expected_map))
+    return fixtures
 
 
 @pytest.fixture(params=_load_fixtures(), ids=lambda x: x[0])
@@ -63,21 +74,12 @@ def fixture_data(request):
 
 def test_schema_engine_matches_fixture(fixture_data):
     """SchemaEngine.validate_dag() output matches expected schemas in fixture."""
-    name, data = fixture_data
-    nodes = data["nodes"]
-    edges = data["edges"]
-    expected = data["expected"]
-
-    actual = engine.validate_dag(nodes, edges)
-
-    for node_id, expected_schema in expected.items():
-        actual_schema = actual.get(node_id, [])
-        actual_normalized = _schema_to_comparable(actual_schema)
-        expected_normalized = [
-            {"name": e["name"], "dtype": e["dtype"], "nullable": e["nullable"]}
-            for e in expected_schema
-        ]
-        assert actual_normalized == expected_normalized, (
-            f"Fixture '{name}', node '{node_id}': "
-            f"expected {expected_normalized}, got {actual_normalized}"
-        )
+    name, data, expected_map = fixture_data
+
+    actual = engine.validate_dag(data["nodes"], data["edges"])
+
+    actual_map = {
+        node_id: _schema_to_comparable(actual.get(node_id, []))
+        for node_id in expected_map
+    }
+    assert actual_map == expected_map, f"Fixture '{name}' schema mismatch"
@@ -11,220 +11,128 @@ SAMPLE_COLUMNS = [
     ColumnSchema(name="price", dtype="float64", nullable=True),
     ColumnSchema(name="quantity", dtype="int64", nullable=True),
 ]
+# Dumped once: transforms only read node config, so tests can share these dicts
+SAMPLE_COLUMN_DICTS = [c.model_dump() for c in SAMPLE_COLUMNS]
 
 
-def make_dag(nodes: list[dict], edges: list[dict]) -> tuple[list[dict], list[dict]]:
-    return nodes, edges
+@pytest.fixture(scope="module")
+def engine():
+    """One engine per module — it holds only the transform registry."""
+    return SchemaEngine()
 
 
-class TestFilterTransform:
-    def test_filter_passthrough_preserves_all_columns(self):
-        engine = SchemaEngine()
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "f1",
-                "type": "filter",
-                "data": {
-                    "config": {"column": "symbol", "operator": "=", "value": "AAPL"}
-                },
-            },
-        ]
-        edges = [{"source": "src", "target": "f1"}]
-        result = engine.validate_dag(nodes, edges)
-        assert len(result["f1"]) == len(SAMPLE_COLUMNS)
+def _node(node_id: str, node_type: str, **config) -> dict:
+    """Build a workflow node dict; kwargs become its data.config."""
+    return {"id": node_id, "type": node_type, "data": {"config": config}}
+
+
+def _src(columns: list[dict] = SAMPLE_COLUMN_DICTS, node_id: str = "src") -> dict:
+    """Build a data_source node emitting *columns* (SAMPLE_COLUMNS by default)."""
+    return _node(node_id, "data_source", columns=columns)
+
+
+def _edge(source: str, target: str) -> dict:
+    return {"source": source, "target": target}
+
+
+class TestPassthroughTransforms:
+    @pytest.mark.parametrize(
+        ("node_type", "config"),
+        [
+            ("filter", {"column": "symbol", "operator": "=", "value": "AAPL"}),
+            ("sort", {"sort_by": [{"column": "price", "direction": "desc"}]}),
+            ("unique", {}),
+            ("sample", {"count": 10}),
+        ],
+    )
+    def test_passthrough_preserves_all_columns(self, engine, node_type, config):
+        """Row-only transforms leave the column list and its order unchanged."""
+        nodes = [_src(), _node("n1", node_type, **config)]
+        result = engine.validate_dag(nodes, [_edge("src", "n1")])
+        assert [c.name for c in result["n1"]] == [c.name for c in SAMPLE_COLUMNS]
 
 
 class TestSelectTransform:
-    def test_select_returns_subset_of_columns(self):
-        engine = SchemaEngine()
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "s1",
-                "type": "select",
-                "data": {"config": {"columns": ["symbol", "price"]}},
-            },
-        ]
-        edges = [{"source": "src", "target": "s1"}]
-        result = engine.validate_dag(nodes, edges)
+    def test_select_returns_subset_of_columns(self, engine):
+        nodes = [_src(), _node("s1", "select", columns=["symbol", "price"])]
+        result = engine.validate_dag(nodes, [_edge("src", "s1")])
         assert len(result["s1"]) == 2
         assert result["s1"][0].name == "symbol"
         assert result["s1"][1].name == "price"
 
 
 class TestGroupByTransform:
-    def test_group_by_produces_group_keys_and_aggregates(self):
-        engine = SchemaEngine()
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "g1",
-                "type": "group_by",
-                "data": {
-                    "config": {
-                        "group_columns": ["symbol"],
-                        "aggregations": [
-                            {
-                                "column": "price",
-                                "function": "AVG",
-                                "alias": "avg_price",
-                                "output_dtype": "float64",
-                            },
-                        ],
-                    }
-                },
-            },
+    def test_group_by_produces_group_keys_and_aggregates(self, engine):
+        nodes = [
+            _src(),
+            _node(
+                "g1",
+                "group_by",
+                group_columns=["symbol"],
+                aggregations=[
+                    {
+                        "column": "price",
+                        "function": "AVG",
+                        "alias": "avg_price",
+                        "output_dtype": "float64",
+                    },
+                ],
+            ),
         ]
-        edges = [{"source": "src", "target": "g1"}]
-        result = engine.validate_dag(nodes, edges)
+        result = engine.validate_dag(nodes, [_edge("src", "g1")])
         assert len(result["g1"]) == 2
         assert result["g1"][0].name == "symbol"
         assert result["g1"][1].name == "avg_price"
 
 
 class TestPivotTransform:
-    def test_pivot_preserves_row_columns(self):
-        engine = SchemaEngine()
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "p1",
-                "type": "pivot",
-                "data": {
-                    "config": {
-                        "row_columns": ["symbol"],
-                        "pivot_column": "quarter",
-                        "value_column": "price",
-                        "aggregation": "SUM",
-                    }
-                },
-            },
-        ]
-        edges = [{"source": "src", "target": "p1"}]
-        result = engine.validate_dag(nodes, edges)
+    def test_pivot_preserves_row_columns(self, engine):
+        nodes = [
+            _src(),
+            _node(
+                "p1",
+                "pivot",
+                row_columns=["symbol"],
+                pivot_column="quarter",
+                value_column="price",
+                aggregation="SUM",
+            ),
+        ]
+        result = engine.validate_dag(nodes, [_edge("src", "p1")])
         assert result["p1"][0].name == "symbol"
 
-    def test_pivot_produces_value_column_with_aggregation(self):
-        engine = SchemaEngine()
+    def test_pivot_produces_value_column_with_aggregation(self, engine):
         nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "p1",
-                "type": "pivot",
-                "data": {
-                    "config": {
-                        "row_columns": ["symbol"],
-                        "pivot_column": "quarter",
-                        "value_column": "price",
-                        "aggregation": "AVG",
-                    }
-                },
-            },
+            _src(),
+            _node(
+                "p1",
+                "pivot",
+                row_columns=["symbol"],
+                pivot_column="quarter",
+                value_column="price",
+                aggregation="AVG",
+            ),
         ]
-        edges = [{"source": "src", "target": "p1"}]
-        result = engine.validate_dag(nodes, edges)
+        result = engine.validate_dag(nodes, [_edge("src", "p1")])
         assert len(result["p1"]) == 2
         assert result["p1"][1].name == "price_avg"
         assert result["p1"][1].dtype == "float64"
 
-    def test_pivot_empty_config_returns_empty(self):
-        engine = SchemaEngine()
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {"id": "p1", "type": "pivot", "data": {"config": {}}},
-        ]
-        edges = [{"source": "src", "target": "p1"}]
-        result = engine.validate_dag(nodes, edges)
+    def test_pivot_empty_config_returns_empty(self, engine):
+        nodes = [_src(), _node("p1", "pivot")]
+        result = engine.validate_dag(nodes, [_edge("src", "p1")])
         assert result["p1"] == []
 
 
-class TestSortTransform:
-    def test_sort_passthrough_preserves_all_columns(self):
-        engine = SchemaEngine()
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "srt",
-                "type": "sort",
-                "data": {
-                    "config": {
-                        "sort_by": [{"column": "price", "direction": "desc"}],
-                    }
-                },
-            },
-        ]
-        edges = [{"source": "src", "target": "srt"}]
-        result = engine.validate_dag(nodes, edges)
-        assert len(result["srt"]) == len(SAMPLE_COLUMNS)
-        assert [c.name for c in result["srt"]] == [c.name for c in SAMPLE_COLUMNS]
-
-
 class TestRenameTransform:
-    def test_rename_output_has_renamed_columns(self):
-        engine = SchemaEngine()
+    def test_rename_output_has_renamed_columns(self, engine):
         nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "ren",
-                "type": "rename",
-                "data": {
-                    "config": {
-                        "rename_map": {"price": "trade_price", "symbol": "ticker"},
-                    }
-                },
-            },
+            _src(),
+            _node(
+                "ren", "rename", rename_map={"price": "trade_price", "symbol": "ticker"}
+            ),
         ]
-        edges = [{"source": "src", "target": "ren"}]
-        result = engine.validate_dag(nodes, edges)
+        result = engine.validate_dag(nodes, [_edge("src", "ren")])
         assert len(result["ren"]) == len(SAMPLE_COLUMNS)
         names = [c.name for c in result["ren"]]
         assert "trade_price" in names
@@ -232,160 +140,51 @@ class TestRenameTransform:
         assert "price" not in names
         assert "symbol" not in names
 
-    def test_rename_preserves_dtype(self):
-        engine = SchemaEngine()
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "ren",
-                "type": "rename",
-                "data": {"config": {"rename_map": {"price": "trade_price"}}},
-            },
-        ]
-        edges = [{"source": "src", "target": "ren"}]
-        result = engine.validate_dag(nodes, edges)
+    def test_rename_preserves_dtype(self, engine):
+        nodes = [_src(), _node("ren", "rename", rename_map={"price": "trade_price"})]
+        result = engine.validate_dag(nodes, [_edge("src", "ren")])
         renamed_col = next(c for c in result["ren"] if c.name == "trade_price")
         assert renamed_col.dtype == "float64"
 
 
 class TestDataSourceTransform:
-    def test_data_source_outputs_config_columns(self):
-        engine = SchemaEngine()
+    def test_data_source_outputs_config_columns(self, engine):
         columns = [
             {"name": "id", "dtype": "int64", "nullable": False},
             {"name": "name", "dtype": "string", "nullable": True},
         ]
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {"config": {"columns": columns}},
-            },
-        ]
-        result = engine.validate_dag(nodes, [])
+        result = engine.validate_dag([_src(columns)], [])
         assert len(result["src"]) == 2
         assert result["src"][0].name == "id"
         assert result["src"][1].name == "name"
 
-    def test_data_source_empty_columns(self):
-        engine = SchemaEngine()
-        nodes = [
-            {"id": "src", "type": "data_source", "data": {"config": {"columns": []}}},
-        ]
-        result = engine.validate_dag(nodes, [])
+    def test_data_source_empty_columns(self, engine):
+        result = engine.validate_dag([_src([])], [])
         assert result["src"] == []
 
 
 class TestFormulaTransform:
-    def test_formula_adds_computed_column(self):
-        engine = SchemaEngine()
+    def test_formula_adds_computed_column(self, engine):
         nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "frm",
-                "type": "formula",
-                "data": {
-                    "config": {
-                        "output_column": "notional",
-                        "output_dtype": "float64",
-                    }
-                },
-            },
+            _src(),
+            _node("frm", "formula", output_column="notional", output_dtype="float64"),
         ]
-        edges = [{"source": "src", "target": "frm"}]
-        result = engine.validate_dag(nodes, edges)
+        result = engine.validate_dag(nodes, [_edge("src", "frm")])
         assert len(result["frm"]) == len(SAMPLE_COLUMNS) + 1
         assert result["frm"][-1].name == "notional"
         assert result["frm"][-1].dtype == "float64"
         assert result["frm"][-1].nullable is True
 
 
-class TestUniqueTransform:
-    def test_unique_passthrough_preserves_all_columns(self):
-        engine = SchemaEngine()
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {"id": "unq", "type": "unique", "data": {"config": {}}},
-        ]
-        edges = [{"source": "src", "target": "unq"}]
-        result = engine.validate_dag(nodes, edges)
-        assert len(result["unq"]) == len(SAMPLE_COLUMNS)
-
-
-class TestSampleTransform:
-    def test_sample_passthrough_preserves_all_columns(self):
-        engine = SchemaEngine()
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {"id": "smp", "type": "sample", "data": {"config": {"count": 10}}},
-        ]
-        edges = [{"source": "src", "target": "smp"}]
-        result = engine.validate_dag(nodes, edges)
-        assert len(result["smp"]) == len(SAMPLE_COLUMNS)
-
-
 class TestMultiNodeDAG:
-    def test_source_filter_select_sort_validates_correctly(self):
-        engine = SchemaEngine()
+    def test_source_filter_select_sort_validates_correctly(self, engine):
         nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "flt",
-                "type": "filter",
-                "data": {
-                    "config": {"column": "symbol", "operator": "=", "value": "AAPL"}
-                },
-            },
-            {
-                "id": "sel",
-                "type": "select",
-                "data": {"config": {"columns": ["symbol", "price"]}},
-            },
-            {
-                "id": "srt",
-                "type": "sort",
-                "data": {
-                    "config": {
-                        "sort_by": [{"column": "price", "direction": "desc"}],
-                    }
-                },
-            },
-        ]
-        edges = [
-            {"source": "src", "target": "flt"},
-            {"source": "flt", "target": "sel"},
-            {"source": "sel", "target": "srt"},
+            _src(),
+            _node("flt", "filter", column="symbol", operator="=", value="AAPL"),
+            _node("sel", "select", columns=["symbol", "price"]),
+            _node("srt", "sort", sort_by=[{"column": "price", "direction": "desc"}]),
         ]
+        edges = [_edge("src", "flt"), _edge("flt", "sel"), _edge("sel", "srt")]
         result = engine.validate_dag(nodes, edges)
         # After select, only symbol and price remain
         assert len(result["sel"]) == 2
@@ -396,27 +195,10 @@ class TestMultiNodeDAG:
 
 
 class TestDisconnectedNodes:
-    def test_disconnected_nodes_handled_gracefully(self):
-        engine = SchemaEngine()
+    def test_disconnected_nodes_handled_gracefully(self, engine):
         nodes = [
-            {
-                "id": "src1",
-                "type": "data_source",
-                "data": {
-                    "config": {
-                        "columns": [{"name": "a", "dtype": "string", "nullable": False}]
-                    }
-                },
-            },
-            {
-                "id": "src2",
-                "type": "data_source",
-                "data": {
-                    "config": {
-                        "columns": [{"name": "b", "dtype": "int64", "nullable": True}]
-                    }
-                },
-            },
+            _src([{"name": "a", "dtype": "string", "nullable": False}], "src1"),
+            _src([{"name": "b", "dtype": "int64", "nullable": True}], "src2"),
         ]
         # No edges — both are independent
         result = engine.validate_dag(nodes, [])
@@ -427,23 +209,15 @@ class TestDisconnectedNodes:
 
 
 class TestUnknownNodeType:
-    def test_unknown_node_type_raises_value_error(self):
-        engine = SchemaEngine()
-        nodes = [
-            {"id": "x", "type": "nonexistent_node", "data": {"config": {}}},
-        ]
+    def test_unknown_node_type_raises_value_error(self, engine):
         with pytest.raises(ValueError, match="Unknown node type"):
-            engine.validate_dag(nodes, [])
+            engine.validate_dag([_node("x", "nonexistent_node")], [])
 
 
 class TestCycleDetection:
-    def test_cycle_raises_value_error(self):
-        engine = SchemaEngine()
-        nodes = [
-            {"id": "a", "type": "filter", "data": {"config": {}}},
-            {"id": "b", "type": "filter", "data": {"config": {}}},
-        ]
-        edges = [{"source": "a", "target": "b"}, {"source": "b", "target": "a"}]
+    def test_cycle_raises_value_error(self, engine):
+        nodes = [_node("a", "filter"), _node("b", "filter")]
+        edges = [_edge("a", "b"), _edge("b", "a")]
         with pytest.raises(ValueError, match="cycle"):
             engine.validate_dag(nodes, edges)
 
@@ -456,19 +230,7 @@ class TestCustomTransformRegistry:
         custom_transforms = {"data_source": data_source_transform}
         engine = SchemaEngine(transforms=custom_transforms)
 
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {
-                        "columns": [
-                            {"name": "x", "dtype": "int64", "nullable": False},
-                        ]
-                    }
-                },
-            },
-        ]
+        nodes = [_src([{"name": "x", "dtype": "int64", "nullable": False}])]
         result = engine.validate_dag(nodes, [])
         assert len(result["src"]) == 1
         assert result["src"][0].name == "x"
@@ -476,33 +238,15 @@ class TestCustomTransformRegistry:
     def test_unknown_type_with_custom_registry_raises(self):
         """Empty custom registry raises ValueError for any node type."""
         engine = SchemaEngine(transforms={})
-        nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {"config": {"columns": []}},
-            },
-        ]
         with pytest.raises(ValueError, match="Unknown node type"):
-            engine.validate_dag(nodes, [])
+            engine.validate_dag([_src([])], [])
 
     def test_default_constructor_uses_module_registry(self):
         """Default constructor (no transforms arg) uses the module-level registry."""
         engine = SchemaEngine()
         nodes = [
-            {
-                "id": "src",
-                "type": "data_source",
-                "data": {
-                    "config": {"columns": [c.model_dump() for c in SAMPLE_COLUMNS]}
-                },
-            },
-            {
-                "id": "f1",
-                "type": "filter",
-                "data": {"config": {"column": "symbol", "operator": "=", "value": "X"}},
-            },
+            _src(),
+            _node("f1", "filter", column="symbol", operator="=", value="X"),
         ]
-        edges = [{"source": "src", "target": "f1"}]
-        result = engine.validate_dag(nodes, edges)
+        result = engine.validate_dag(nodes, [_edge("src", "f1")])
         assert len(result["f1"]) == len(SAMPLE_COLUMNS)
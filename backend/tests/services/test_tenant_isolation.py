@@ -70,7 +70,6 @@ def _make_request(headers: dict | None = None) -> Request:
 class TestGetCurrentTenantId:
     """Verify get_current_tenant_id extracts tenant from JWT."""
 
-    @pytest.mark.asyncio
     async def test_missing_auth_header_returns_401(self):
         request = _make_request()
         with patch("app.core.auth.settings") as mock_settings:
@@ -79,7 +78,6 @@ class TestGetCurrentTenantId:
                 await get_current_tenant_id(request)
             assert exc_info.value.status_code == 401
 
-    @pytest.mark.asyncio
     async def test_invalid_bearer_prefix_returns_401(self):
         request = _make_request({"Authorization": "Basic abc123"})
         with patch("app.core.auth.settings") as mock_settings:
@@ -88,7 +86,6 @@ class TestGetCurrentTenantId:
                 await get_current_tenant_id(request)
             assert exc_info.value.status_code == 401
 
-    @pytest.mark.asyncio
     async def test_missing_tenant_id_claim_returns_403(self):
         """A valid token without tenant_id claim should be rejected."""
         with patch(
@@ -101,7 +98,6 @@ class TestGetCurrentTenantId:
             assert exc_info.value.status_code == 403
             assert "tenant_id" in exc_info.value.detail
 
-    @pytest.mark.asyncio
     async def test_valid_tenant_id_claim_returns_uuid(self):
         tenant_uuid = uuid.uuid4()
         with patch(
@@ -119,7 +115,6 @@ class TestGetCurrentTenantId:
 class TestGetCurrentUserId:
     """Verify get_current_user_id extracts user from JWT."""
 
-    @pytest.mark.asyncio
     async def test_missing_auth_header_returns_401(self):
         request = _make_request()
         with patch("app.core.auth.settings") as mock_settings:
@@ -128,7 +123,6 @@ class TestGetCurrentUserId:
                 await get_current_user_id(request)
             assert exc_info.value.status_code == 401
 
-    @pytest.mark.asyncio
     async def test_missing_sub_claim_returns_401(self):
         with patch(
             "app.core.auth._decode_token", new_callable=AsyncMock
@@ -139,7 +133,6 @@ class TestGetCurrentUserId:
                 await get_current_user_id(request)
             assert exc_info.value.status_code == 401
 
-    @pytest.mark.asyncio
     async def test_valid_sub_claim_returns_uuid(self):
         user_uuid = uuid.uuid4()
         with patch(
@@ -151,6 +144,25 @@ class TestGetCurrentUserId:
             assert result == user_uuid
 
 
+class TestTokenDecodedOncePerRequest:
+    """Auth dependencies on the same request share one JWT decode."""
+
+    async def test_tenant_and_user_dependencies_decode_token_once(self):
+        tenant_uuid = uuid.uuid4()
+        user_uuid = uuid.uuid4()
+        with patch(
+            "app.core.auth._decode_token", new_callable=AsyncMock
+        ) as mock_decode:
+            mock_decode.return_value = {
+                "sub": str(user_uuid),
+                "tenant_id": str(tenant_uuid),
+            }
+            request = _make_request({"Authorization": "Bearer valid-token"})
+            assert await get_current_tenant_id(request) == tenant_uuid
+            assert await get_current_user_id(request) == user_uuid
+            mock_decode.assert_awaited_once_with("valid-token")
+
+
 # ── Preview Cache Key Isolation ──────────────────────────────────────────
 
 
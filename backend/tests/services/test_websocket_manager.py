@@ -5,7 +5,7 @@ import contextlib
 import json
 import sys
 from pathlib import Path
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
@@ -18,22 +18,37 @@ if str(backend_path) not in sys.path:
 from fastapi import WebSocket  # noqa: E402
 
 # Import metrics and manager directly (without app dependencies)
-from app.core.metrics import websocket_connections_active  # noqa: E402
+from app.core.metrics import (  # noqa: E402
+    websocket_connections_active,
+    websocket_messages_sent_total,
+    websocket_publish_failures_total,
+)
 from app.services.websocket_manager import WebSocketManager  # noqa: E402
 
 
 @pytest.fixture
-def mock_redis():
+def mock_pipeline():
+    """Mock Redis pipeline used for batched publishes."""
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute = AsyncMock()
+    return pipe
+
+
+@pytest.fixture
+def mock_redis(mock_pipeline):
     """Mock Redis client."""
     redis = AsyncMock()
-    redis.publish = AsyncMock()
+    redis.pipeline = MagicMock(return_value=mock_pipeline)
     return redis
 
 
 @pytest.fixture
-def ws_manager(mock_redis):
+async def ws_manager(mock_redis):
     """WebSocketManager instance with mocked Redis."""
-    return WebSocketManager(redis=mock_redis)
+    manager = WebSocketManager(redis=mock_redis)
+    yield manager
+    await manager.aclose()
 
 
 @pytest.fixture
@@ -168,6 +183,35 @@ class TestStaleEntryCleanup:
         assert "channel:3" in ws_manager._ws_channels[mock_websocket]
 
 
+class TestBroadcastFanOut:
+    """Tests for concurrent delivery to subscribers of a channel."""
+
+    async def test_broadcast_sends_to_subscribers_concurrently(self, ws_manager):
+        """Every subscriber's send should be in flight at the same time."""
+        subscribers = [AsyncMock(spec=WebSocket) for _ in range(3)]
+        all_started = asyncio.Event()
+        started = 0
+
+        async def send_text(_message):
+            nonlocal started
+            started += 1
+            if started == len(subscribers):
+                all_started.set()
+            await all_started.wait()
+
+        for ws in subscribers:
+            ws.send_text = AsyncMock(side_effect=send_text)
+        ws_manager._connections["channel:1"] = set(subscribers)
+
+        # Sequential sends would block forever on the first subscriber
+        await asyncio.wait_for(
+            ws_manager._broadcast_to_channel("channel:1", "test"), timeout=1
+        )
+
+        for ws in subscribers:
+            ws.send_text.assert_awaited_once_with("test")
+
+
 class TestHeartbeat:
     """Tests for H9 — WebSocket heartbeat/ping implementation."""
 
@@ -230,7 +274,7 @@ class TestHeartbeat:
 class TestPublishMethods:
     """Test Redis pub/sub publishing methods."""
 
-    async def test_publish_execution_status(self, ws_manager, mock_redis):
+    async def test_publish_execution_status(self, ws_manager, mock_pipeline):
         """publish_execution_status should format and publish correctly."""
         tenant_id = uuid4()
         execution_id = uuid4()
@@ -243,8 +287,10 @@ class TestPublishMethods:
             data={"progress": 50},
         )
 
-        mock_redis.publish.assert_called_once()
-        channel, message_str = mock_redis.publish.call_args[0]
+        await ws_manager.flush_now()
+
+        mock_pipeline.publish.assert_called_once()
+        channel, message_str = mock_pipeline.publish.call_args[0]
 
         assert channel == f"flowforge:{tenant_id}:execution:{execution_id}"
         message = json.loads(message_str)
@@ -254,7 +300,7 @@ class TestPublishMethods:
         assert message["status"] == "running"
         assert message["data"]["progress"] == 50
 
-    async def test_publish_live_data(self, ws_manager, mock_redis):
+    async def test_publish_live_data(self, ws_manager, mock_pipeline):
         """publish_live_data should format and publish correctly."""
         tenant_id = uuid4()
         widget_id = uuid4()
@@ -265,8 +311,10 @@ class TestPublishMethods:
             data={"rows": [{"col1": "val1"}]},
         )
 
-        mock_redis.publish.assert_called_once()
-        channel, message_str = mock_redis.publish.call_args[0]
+        await ws_manager.flush_now()
+
+        mock_pipeline.publish.assert_called_once()
+        channel, message_str = mock_pipeline.publish.call_args[0]
 
         assert channel == f"flowforge:{tenant_id}:widget:{widget_id}"
         message = json.loads(message_str)
@@ -274,6 +322,102 @@ class TestPublishMethods:
         assert message["widget_id"] == str(widget_id)
         assert message["data"]["rows"][0]["col1"] == "val1"
 
+    async def test_publish_live_data_with_integer_beyond_64_bits(
+        self, ws_manager, mock_pipeline
+    ):
+        """Integers orjson can't encode are still published, not raised."""
+        await ws_manager.publish_live_data(
+            tenant_id=uuid4(), widget_id=uuid4(), data={"total": 2**70}
+        )
+
+        await ws_manager.flush_now()
+
+        _, message_str = mock_pipeline.publish.call_args[0]
+        assert json.loads(message_str)["data"]["total"] == 2**70
+
+    async def test_concurrent_publishes_share_one_pipeline(
+        self, ws_manager, mock_redis, mock_pipeline
+    ):
+        """Publishes queued before a flush go out in a single round-trip."""
+        tenant_id = uuid4()
+        for _ in range(5):
+            await ws_manager.publish_live_data(
+                tenant_id=tenant_id, widget_id=uuid4(), data={}
+            )
+
+        await ws_manager.flush_now()
+
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        assert mock_pipeline.publish.call_count == 5
+        mock_pipeline.execute.assert_awaited_once()
+
+    async def test_aclose_publishes_pending_messages(self, ws_manager, mock_pipeline):
+        """aclose should flush queued messages instead of dropping them."""
+        await ws_manager.publish_execution_status(
+            tenant_id=uuid4(),
+            execution_id=uuid4(),
+            node_id="__workflow__",
+            status="cancelled",
+        )
+
+        await ws_manager.aclose()
+
+        mock_pipeline.publish.assert_called_once()
+        assert ws_manager._flush_task.done()
+
+    async def test_sent_counter_counts_only_published_messages(
+        self, ws_manager, mock_pipeline
+    ):
+        """Messages are counted as sent after the pipeline executes, not on enqueue."""
+        sent = websocket_messages_sent_total.labels(message_type="live_data")
+        initial = sent._value.get()
+
+        await ws_manager.publish_live_data(
+            tenant_id=uuid4(), widget_id=uuid4(), data={}
+        )
+        assert sent._value.get() == initial
+
+        await ws_manager.flush_now()
+        assert sent._value.get() == initial + 1
+
+    async def test_failed_publish_is_counted_and_raised(
+        self, ws_manager, mock_pipeline
+    ):
+        """A Redis error counts the batch as failed and reaches the caller."""
+        sent = websocket_messages_sent_total.labels(message_type="live_data")
+        failed = websocket_publish_failures_total.labels(message_type="live_data")
+        initial_sent, initial_failed = sent._value.get(), failed._value.get()
+        mock_pipeline.execute.side_effect = ConnectionError("Redis down")
+
+        await ws_manager.publish_live_data(
+            tenant_id=uuid4(), widget_id=uuid4(), data={}
+        )
+        with pytest.raises(ConnectionError):
+            await ws_manager.flush_now()
+
+        assert sent._value.get() == initial_sent
+        assert failed._value.get() == initial_failed + 1
+
+    async def test_cancel_during_execute_does_not_republish(
+        self, ws_manager, mock_pipeline
+    ):
+        """A batch already handed to execute() isn't resent when the flusher stops."""
+        executing = asyncio.Event()
+
+        async def _slow_execute():
+            executing.set()
+            await asyncio.Event().wait()
+
+        mock_pipeline.execute.side_effect = _slow_execute
+        await ws_manager.publish_live_data(
+            tenant_id=uuid4(), widget_id=uuid4(), data={}
+        )
+        await executing.wait()
+
+        await ws_manager.aclose()
+
+        mock_pipeline.publish.assert_called_once()
+
 
 class TestChannelManagement:
     """Test channel subscription and unsubscription."""
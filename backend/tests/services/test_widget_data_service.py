@@ -9,8 +9,6 @@ from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
-import pytest
-
 # Ensure backend is on sys.path
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
@@ -84,7 +82,6 @@ def _make_service(
 # ── Tests ─────────────────────────────────────────────────────────────────
 
 
-@pytest.mark.asyncio
 async def test_cache_hit_returns_cached_data():
     """Cache hit returns cached data without compiling or executing."""
     cached_data = {
@@ -111,7 +108,6 @@ async def test_cache_hit_returns_cached_data():
     svc._query_router.execute_all.assert_not_called()
 
 
-@pytest.mark.asyncio
 async def test_cache_miss_compiles_and_executes():
     """Cache miss compiles subgraph and executes queries."""
     svc = _make_service()
@@ -129,7 +125,6 @@ async def test_cache_miss_compiles_and_executes():
     svc._query_router.execute_all.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_different_config_overrides_produce_different_cache_keys():
     """Different config_overrides should produce different cache keys."""
     svc = _make_service()
@@ -167,7 +162,6 @@ async def test_different_config_overrides_produce_different_cache_keys():
     assert key_a != key_b
 
 
-@pytest.mark.asyncio
 async def test_same_inputs_produce_same_cache_key():
     """Identical inputs should produce the same cache key (dedup)."""
     svc = _make_service()
@@ -200,7 +194,21 @@ async def test_same_inputs_produce_same_cache_key():
     assert key_1 == key_2
 
 
-@pytest.mark.asyncio
+async def test_cache_key_accepts_integers_beyond_64_bits():
+    """Filter values outside orjson's integer range still hash to a stable key."""
+    svc = _make_service()
+    tenant_id = uuid4()
+    graph = _make_graph()
+    args = (tenant_id, "node_1", graph["nodes"], graph["edges"], {})
+
+    key_1 = svc._compute_cache_key(*args, {"x": 10**20}, 0, 100)
+    key_2 = svc._compute_cache_key(*args, {"x": 10**20}, 0, 100)
+    key_3 = svc._compute_cache_key(*args, {"x": 10**20 + 1}, 0, 100)
+
+    assert key_1 == key_2
+    assert key_1 != key_3
+
+
 async def test_ttl_varies_by_segment_target():
     """Materialize segments get shorter TTL than ClickHouse."""
     svc = _make_service()
@@ -209,7 +217,6 @@ async def test_ttl_varies_by_segment_target():
     assert svc._ttl_for_target("clickhouse") == 300
 
 
-@pytest.mark.asyncio
 async def test_redis_failure_fails_open():
     """Redis errors should not prevent data from being returned."""
     svc = _make_service(redis_fail=True)
@@ -225,7 +232,6 @@ async def test_redis_failure_fails_open():
     assert result["total_rows"] == 1
 
 
-@pytest.mark.asyncio
 async def test_clickhouse_queries_include_settings():
     """ClickHouse-targeted queries must include SETTINGS for resource limits."""
     svc = _make_service()
@@ -247,7 +253,6 @@ async def test_clickhouse_queries_include_settings():
     assert "max_rows_to_read=50000000" in final_sql
 
 
-@pytest.mark.asyncio
 async def test_non_clickhouse_queries_skip_settings():
     """Non-ClickHouse queries (e.g. Materialize) must NOT include SETTINGS."""
     materialize_segments = [